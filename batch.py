@@ -0,0 +1,101 @@
+# batch.py
+"""
+Play many headless games in parallel worker processes and collect
+per-level results into one CSV or JSON file.
+
+    python batch.py --games 16 --difficulties easy very_hard --levels 1 3 --output results.csv
+"""
+import argparse
+import csv
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from world import DIFFICULTIES, World
+
+FIELDS = ['game', 'seed', 'difficulty', 'swarm_size', 'population_size', 'chromosome_length', 'mutation_rate',
+          'level', 'cleared', 'score', 'ticks', 'time', 'collisions', 'generations']
+
+
+def play_game(game_id, seed, difficulty, levels, population_size, chromosome_length, mutation_rate, max_ticks,
+              swarm_size):
+    """Play one headless game and return a result row per level."""
+    world = World(difficulty=difficulty, population_size=population_size, chromosome_length=chromosome_length,
+                  mutation_rate=mutation_rate, swarm_size=swarm_size, seed=seed)
+    rows = []
+    for level in range(1, levels + 1):
+        stats = world.run_level(max_ticks=max_ticks)
+        rows.append({
+            'game': game_id,
+            'seed': seed,
+            'difficulty': difficulty,
+            'swarm_size': swarm_size if difficulty == 'swarm' else '',
+            'population_size': population_size,
+            'chromosome_length': chromosome_length,
+            'mutation_rate': mutation_rate,
+            'level': level,
+            'cleared': stats['cleared'],
+            'score': stats['score'],
+            'ticks': stats['ticks'],
+            'time': round(stats['time'], 3),  # Simulated seconds to clear the level
+            'collisions': stats['collisions'],
+            'generations': stats['generations'],
+        })
+    return rows
+
+
+def write_results(rows, path):
+    if path.endswith('.json'):
+        with open(path, 'w') as f:
+            json.dump(rows, f, indent=2)
+    else:
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--games', type=int, default=os.cpu_count())
+    parser.add_argument('--difficulties', nargs='+', default=['easy', 'medium', 'hard', 'very_hard'],
+                        choices=list(DIFFICULTIES), help='Assigned to games in turn')
+    parser.add_argument('--levels', type=int, nargs='+', default=[1], help='Level counts, assigned to games in turn')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the first game; game i uses seed + i')
+    parser.add_argument('--swarm-size', type=int, default=100, help='Ghosts in swarm games')
+    parser.add_argument('--population-size', type=int, default=100)
+    parser.add_argument('--chromosome-length', type=int, default=50)
+    parser.add_argument('--mutation-rate', type=float, default=0.1)
+    parser.add_argument('--max-ticks', type=int, default=100000, help='Give up on a level after this many ticks')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Worker processes (default: all cores)')
+    parser.add_argument('--output', default='results.csv', help='.csv or .json')
+    args = parser.parse_args()
+
+    rows = []
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        futures = [
+            executor.submit(
+                play_game, game_id, args.seed + game_id,
+                args.difficulties[game_id % len(args.difficulties)], args.levels[game_id % len(args.levels)],
+                args.population_size, args.chromosome_length, args.mutation_rate, args.max_ticks, args.swarm_size,
+            )
+            for game_id in range(args.games)
+        ]
+        for future in as_completed(futures):
+            game_rows = future.result()
+            rows.extend(game_rows)
+            total_score = sum(row['score'] for row in game_rows)
+            print(f"Game {game_rows[0]['game']} ({game_rows[0]['difficulty']}, seed {game_rows[0]['seed']}): "
+                  f"{len(game_rows)} level(s), total score {total_score}")
+
+    elapsed = time.perf_counter() - start
+    rows.sort(key=lambda row: (row['game'], row['level']))
+    write_results(rows, args.output)
+    print(f"{args.games} games on {args.workers} workers in {elapsed:.1f}s: "
+          f"{args.games / elapsed * 60:.1f} games/minute, results in {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,89 @@
+# benchmarks/fast_forward.py
+"""
+Check that fast-forwarding the game window does not change a seeded game's outcome.
+
+    python -m benchmarks.fast_forward --difficulty very_hard --seed 7
+
+Plays the same seeded level in the window (on an off-screen display) at
+each speed, reports the outcome and the wall time, and exits with status 1
+if any speed ends differently from 1x. Then plays an unseeded level the way
+real play starts, at 1x with the background planner, and switches to 16x
+partway: it fails unless Pac-Man keeps following the GA the planner evolved.
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+from config import FPS, SIMULATION_SPEEDS
+from world import DIFFICULTIES
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--difficulty', default='very_hard', choices=list(DIFFICULTIES))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-frames', type=int, default=100000, help='Give up on the level after this many frames')
+    parser.add_argument('--planner-frames', type=int, default=120,
+                        help='Frames played at 1x with the background planner before switching to 16x')
+    args = parser.parse_args()
+
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')  # The game renders to an off-screen display
+    from main import Game
+
+    outcomes = {}
+    print(f"{'speed':>6} {'frames':>7} {'ticks':>6} {'score':>6} {'collisions':>10} {'wall s':>7}")
+    for speed in range(len(SIMULATION_SPEEDS)):
+        with contextlib.redirect_stdout(io.StringIO()):  # Per-generation GA output
+            game = Game(seed=args.seed)
+            game.difficulty = args.difficulty
+            game.speed = speed
+            game.init_game()
+            start = time.perf_counter()
+            frames = 1
+            while not game.simulate_frame() and frames < args.max_frames:
+                frames += 1
+            elapsed = time.perf_counter() - start
+            game.world.stop()
+        world = game.world
+        outcomes[speed] = (world.level_ticks, world.score, world.collisions)
+        print(f"{game.speed_label()[7:]:>6} {frames:>7} {world.level_ticks:>6} {world.score:>6} "
+              f"{world.collisions:>10} {elapsed:>7.2f}")
+
+    # Real play: 1x runs the background planner, Tab must hand its GA over to lockstep
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = Game()
+        game.difficulty = args.difficulty
+        game.init_game()
+        planner = game.world.planner
+        for _ in range(args.planner_frames):
+            game.simulate_frame()
+            game.clock.tick(FPS)  # Real frame pacing: the planner evolves between frames
+        planned = planner.generations
+        followed = game.player.ga is planner.ga and len(planner.ga.fitness_history) >= planned
+        game.speed = SIMULATION_SPEEDS.index(16)
+        game.apply_speed()
+        frames = args.planner_frames
+        while not game.simulate_frame() and frames < args.max_frames:
+            frames += 1
+        game.world.stop()
+    world = game.world
+    print(f"1x -> 16x after {args.planner_frames} frames: {planned} planner generations handed over, "
+          f"{len(world.ga.fitness_history)} in all; {world.level_ticks} ticks, score {world.score}, "
+          f"{world.collisions} collisions")
+
+    failed = False
+    if any(outcome != outcomes[0] for outcome in outcomes.values()):
+        print("Outcomes differ between speeds")
+        failed = True
+    if not followed or planned == 0:
+        print("Fast-forwarding did not continue the background planner's GA")
+        failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
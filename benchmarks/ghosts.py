@@ -0,0 +1,47 @@
+# benchmarks/ghosts.py
+"""
+Tick cost of the struct-of-arrays ghost system against the number of ghosts.
+
+    python -m benchmarks.ghosts --counts 4 50 100 250 500
+"""
+import argparse
+import random
+import time
+
+from config import TILESIZE
+from world import World
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--counts', type=int, nargs='+', default=[4, 50, 100, 250, 500])
+    parser.add_argument('--ticks', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'ghosts':>6} {'us/tick':>9} {'us/ghost':>9}")
+    for count in args.counts:
+        random.seed(args.seed)
+        world = World(difficulty='swarm', swarm_size=count)
+        world.start_level()
+        world.ghost_navigation.next_hop_table()  # Built once per map, keep it out of the timing
+        player = world.player
+        graph = world.graph
+
+        elapsed = 0.0
+        for tick in range(args.ticks):
+            # The player random-walks one tile every 8 ticks so the ghosts keep replanning
+            if tick % 8 == 0:
+                player.tile_x, player.tile_y = random.choice(graph.adjacent[graph.tile_id((player.tile_x, player.tile_y))])
+                player.rect.topleft = (player.tile_x * TILESIZE, player.tile_y * TILESIZE)
+            start = time.perf_counter()
+            world.ghosts.step(player)
+            world.ghosts.collides(player.rect)
+            elapsed += time.perf_counter() - start
+
+        per_tick = elapsed / args.ticks * 1e6
+        print(f"{count:>6} {per_tick:>9.1f} {per_tick / count:>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+# benchmarks/headless.py
+"""
+Headless throughput benchmark: plays full levels without a display and
+reports how many times faster than real time (FPS ticks per second) they ran.
+
+    python -m benchmarks.headless --difficulty very_hard --levels 3
+"""
+import argparse
+import random
+import time
+
+from config import FPS
+from profiler import Profiler
+from world import DIFFICULTIES, World
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--difficulty', default='easy', choices=list(DIFFICULTIES))
+    parser.add_argument('--swarm-size', type=int, default=100, help='Ghosts in the swarm difficulty')
+    parser.add_argument('--levels', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--max-ticks', type=int, default=100000, help='Give up on a level after this many ticks')
+    parser.add_argument('--budget-ms', type=float, default=None,
+                        help='Run the GA in anytime mode with this many milliseconds per tick')
+    parser.add_argument('--fitness-cache', type=int, default=0, metavar='SIZE',
+                        help='Memoize up to SIZE fitness scores per GA')
+    parser.add_argument('--receding-horizon', action='store_true',
+                        help="Warm-start the GA population after every move")
+    parser.add_argument('--profile', metavar='PATH', default=None,
+                        help='Time the tick and its model calls, print percentiles and write them to PATH (.json or .csv)')
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    budget = None if args.budget_ms is None else args.budget_ms / 1000
+    world = World(difficulty=args.difficulty, swarm_size=args.swarm_size, ga_budget=budget,
+                  receding_horizon=args.receding_horizon, fitness_cache_size=args.fitness_cache,
+                  profiler=Profiler() if args.profile else None)
+    total_ticks = 0
+    total_elapsed = 0.0
+    for level in range(1, args.levels + 1):
+        start = time.perf_counter()
+        stats = world.run_level(max_ticks=args.max_ticks)
+        elapsed = time.perf_counter() - start
+        total_ticks += stats['ticks']
+        total_elapsed += elapsed
+        print(f"Level {level}: {'cleared' if stats['cleared'] else 'timed out'} in {stats['ticks']} ticks "
+              f"({stats['time']:.1f}s game time), score {stats['score']}, "
+              f"{stats['collisions']} collisions, {stats['tilemap_scans']} tilemap scans, "
+              f"{stats['pellet_index_rebuilds']} pellet index rebuilds, "
+              f"{stats['fitness_cache_hit_rate']:.1%} fitness cache hits, {elapsed:.2f}s wall, "
+              f"{stats['ticks'] / FPS / elapsed:.1f}x real time")
+        if budget is not None:
+            per_frame = world.ga.generations_per_frame  # One entry per evolution, reset every level
+            print(f"  GA budget {args.budget_ms:g} ms: {sum(per_frame) / len(per_frame):.1f} generations/frame "
+                  f"(min {min(per_frame)}, max {max(per_frame)}), {stats['budget_overruns']} overruns")
+
+    print(f"Total: {total_ticks} ticks in {total_elapsed:.2f}s, "
+          f"{total_ticks / total_elapsed:.0f} ticks/s, {total_ticks / FPS / total_elapsed:.1f}x real time")
+    if world.profiler is not None:
+        print('\n'.join(world.profiler.lines()))
+        world.profiler.dump(args.profile)
+
+
+if __name__ == '__main__':
+    main()
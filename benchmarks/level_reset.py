@@ -0,0 +1,61 @@
+# benchmarks/level_reset.py
+"""
+Level reset cost: time and memory allocated per level start, for the
+headless world and for the rendered game.
+
+    python -m benchmarks.level_reset --resets 200
+"""
+import argparse
+import os
+import random
+import time
+import tracemalloc
+
+
+def measure(reset, resets):
+    """
+    Mean seconds per call of reset, and the mean peak of memory allocated
+    during a call (everything a reset builds, even if it frees it again).
+    """
+    reset()  # Warm up: first-level setup and caches are not per-level costs
+    start = time.perf_counter()
+    for _ in range(resets):
+        reset()
+    elapsed = (time.perf_counter() - start) / resets
+
+    tracemalloc.start()
+    peak = 0
+    for _ in range(resets):
+        current = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        reset()
+        peak += tracemalloc.get_traced_memory()[1] - current
+    tracemalloc.stop()
+    return elapsed, peak / resets
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--difficulty', default='very_hard')
+    parser.add_argument('--resets', type=int, default=200)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')  # The game renders to an off-screen display
+    from main import Game
+    from world import World
+
+    random.seed(args.seed)
+    world = World(difficulty=args.difficulty)
+    game = Game()
+    game.difficulty = args.difficulty
+    game.world.planner = None  # Keep the background GA out of the measurement
+
+    print(f"{'reset':>18} {'ms':>8} {'peak KiB':>9}")
+    for name, reset in [('World.start_level', world.start_level), ('Game.init_game', game.init_game)]:
+        elapsed, allocated = measure(reset, args.resets)
+        print(f"{name:>18} {elapsed * 1000:>8.3f} {allocated / 1024:>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+# benchmarks/operators.py
+"""
+Generation time of the per-individual GA operators against the vectorized ones.
+
+    python -m benchmarks.operators --populations 100 1000 10000
+
+Breeding is selection, crossover and mutation; a generation adds the fitness
+evaluation of the population.
+"""
+import argparse
+import random
+import time
+from types import SimpleNamespace
+
+from config import original_tilemap
+from model import GeneticAlgorithm
+
+
+def best_time(function, repeats):
+    best = float('inf')
+    for _ in range(repeats):
+        begin = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - begin)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--populations', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--chromosome-length', type=int, default=50)
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    tilemap = [list(row) for row in original_tilemap]
+    start, target = (2, 9), (19, 19)
+    ghost_positions = [(9, 9), (10, 7), (15, 13), (4, 17)]
+    game = SimpleNamespace(player=SimpleNamespace(tile_x=start[0], tile_y=start[1]),
+                           ghosts=SimpleNamespace(positions=lambda: ghost_positions))
+
+    print(f"chromosome length {args.chromosome_length}, best of {args.repeats}")
+    print(f"{'population':>10} {'operators':>10} {'breed ms':>10} {'generation ms':>14} {'speedup':>8}")
+    for population_size in args.populations:
+        baseline = None
+        for vectorized in (False, True):
+            random.seed(args.seed)
+            ga = GeneticAlgorithm(population_size, args.chromosome_length, 0.1, tilemap, verbose=False,
+                                  vectorized=vectorized)
+            a_star_path = ga.pathfinder.find_path(start, target)
+            population = ga.population
+            scores = ga.evaluate_population(game, population, a_star_path, ghost_positions)
+
+            breed = best_time(lambda: ga.next_generation(population.copy(), scores), args.repeats)
+
+            def generation():
+                fitness = ga.evaluate_population(game, population, a_star_path, ghost_positions)
+                ga.next_generation(population.copy(), fitness)
+            total = best_time(generation, args.repeats)
+
+            baseline = baseline or total
+            label = 'vectorized' if vectorized else 'loops'
+            print(f"{population_size:>10} {label:>10} {breed * 1000:>10.2f} {total * 1000:>14.2f} "
+                  f"{baseline / total:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+# benchmarks/parallel_fitness.py
+"""
+Scaling of process-pool fitness evaluation with the number of workers.
+
+    python -m benchmarks.parallel_fitness --workers 1 2 4 8 --populations 1000 5000 20000
+"""
+import argparse
+import os
+import random
+import time
+
+import numpy as np
+
+from config import original_tilemap
+from model import GENE_DTYPE, BatchFitnessEvaluator, GeneticAlgorithm, ParallelFitnessEvaluator
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--populations', type=int, nargs='+', default=[1000, 5000, 20000])
+    parser.add_argument('--chromosome-length', type=int, default=100)
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    tilemap = [list(row) for row in original_tilemap]
+    ga = GeneticAlgorithm(2, 2, 0.1, tilemap, verbose=False)
+    start, target = (2, 9), (19, 19)
+    a_star_path = ga.pathfinder.find_path(start, target)
+    ghost_positions = [(9, 9), (10, 7), (15, 13), (4, 17)]
+    rng = np.random.default_rng(args.seed)
+    random.seed(args.seed)
+
+    print(f"{os.cpu_count()} CPUs, chromosome length {args.chromosome_length}, best of {args.repeats}")
+    print(f"{'population':>10} " + ' '.join(f"{f'{w} worker(s)':>14}" for w in args.workers))
+    for population_size in args.populations:
+        genes = rng.integers(0, 4, size=(population_size, args.chromosome_length), dtype=GENE_DTYPE)
+        expected = BatchFitnessEvaluator(tilemap).evaluate(genes, start, a_star_path, ghost_positions, ga.get_direction)
+        cells = []
+        for workers in args.workers:
+            evaluator = ParallelFitnessEvaluator(tilemap, workers, min_population=0)
+            scores = evaluator.evaluate(genes, start, a_star_path, ghost_positions, ga.get_direction)  # Warm up the pool
+            assert np.array_equal(scores, expected)
+            best = float('inf')
+            for _ in range(args.repeats):
+                begin = time.perf_counter()
+                evaluator.evaluate(genes, start, a_star_path, ghost_positions, ga.get_direction)
+                best = min(best, time.perf_counter() - begin)
+            evaluator.close()
+            cells.append(f"{best * 1000:11.1f} ms")
+        print(f"{population_size:>10} " + ' '.join(f"{cell:>14}" for cell in cells))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,176 @@
+# benchmarks/suite.py
+"""
+Reproducible timings of the model and navigation hot paths, checked against a saved baseline.
+
+    python -m benchmarks.suite --output baseline.json
+    python -m benchmarks.suite --baseline baseline.json --threshold 0.25
+
+Every case runs on a fixed map state (half the pellets eaten, in tile order)
+with fixed seeds, without a display. Each timed run starts from a freshly
+built case and one untimed warm-up call, so first-call setup is not timed
+and cases that change their own state (GA populations, ghost positions)
+repeat the same sequence of calls in every run. A case regresses when its median time
+per call exceeds the baseline's by more than the threshold; the run then
+exits with status 1. Baselines are machine specific: save one per machine.
+"""
+import argparse
+import json
+import sys
+import time
+from types import SimpleNamespace
+
+from config import original_tilemap
+from ghosts import GhostSystem
+from model import AdversarialAlgorithm, AStarAlgorithm, GeneticAlgorithm
+from navigation import GhostNavigator, PelletIndex, navigation_graph
+from world import GHOST_TILES
+
+GHOST_POSITIONS = [(9, 9), (10, 7), (15, 13), (4, 17)]
+
+
+def mid_level_state():
+    """The map with every other pellet eaten, and a game view of it for the model calls."""
+    tilemap = [list(row) for row in original_tilemap]
+    graph = navigation_graph(tilemap)
+    pellets = [(x, y) for y, row in enumerate(tilemap) for x, tile in enumerate(row) if tile == '.']
+    for x, y in pellets[::2]:
+        tilemap[y][x] = ' '
+    spawn = next((x, y) for y, row in enumerate(tilemap) for x, tile in enumerate(row) if tile == 'P')
+    homes = {GHOST_TILES[tile]: (x, y) for y, row in enumerate(tilemap) for x, tile in enumerate(row)
+             if tile in GHOST_TILES}
+    game = SimpleNamespace(player=SimpleNamespace(tile_x=spawn[0], tile_y=spawn[1], direction=(1, 0)),
+                           ghosts=SimpleNamespace(positions=lambda: GHOST_POSITIONS),
+                           pellet_index=PelletIndex(graph, tilemap))
+    return tilemap, graph, game, homes
+
+
+def cases(seed):
+    """Name -> factory building the zero-argument callable benchmarked, in its initial state."""
+    tilemap, graph, game, homes = mid_level_state()
+    start = (game.player.tile_x, game.player.tile_y)
+    pathfinder = AStarAlgorithm(tilemap)
+    far = max(graph.walkable_ids, key=lambda tile_id: graph.distance(start, graph.positions[tile_id]))
+    far = graph.positions[far]
+    near = pathfinder.find_path(start, far)[4]
+    walled_in = {graph.positions[neighbor] for neighbor in graph.neighbors[graph.tile_id(far)]}
+
+    # Stateless calls: the factory hands out the same callable every run
+    benchmarks = {
+        'astar.short': lambda: lambda: pathfinder.find_path(start, near),
+        'astar.long': lambda: lambda: pathfinder.find_path(start, far),
+        'astar.blocked': lambda: lambda: pathfinder.find_path(start, far, walled_in),  # Explores every reachable tile
+    }
+
+    # GA evolution changes the population: every run gets a new GA with the same seed
+    def evolve(population_size):
+        ga = GeneticAlgorithm(population_size, 50, 0.1, tilemap, verbose=False, seed=seed)
+        return lambda: ga.evolve(game, None)
+    for population_size in (10, 100, 1000):
+        benchmarks[f'ga.evolve.{population_size}'] = lambda size=population_size: evolve(size)
+
+    ga = GeneticAlgorithm(100, 50, 0.1, tilemap, verbose=False, seed=seed)
+    a_star_path = pathfinder.find_path(start, far)
+    chromosome = ga.population[0]
+    adversarial = GeneticAlgorithm(100, 50, 0.1, tilemap, verbose=False, seed=seed)
+    adversarial.adversarial_algorithm = AdversarialAlgorithm(game, tilemap, adversarial, pathfinder)
+    benchmarks['ga.evaluate_fitness'] = \
+        lambda: lambda: ga.evaluate_fitness(game, chromosome, a_star_path, GHOST_POSITIONS)
+    benchmarks['ga.evaluate_fitness.adversarial'] = \
+        lambda: lambda: adversarial.evaluate_fitness(game, chromosome, a_star_path, GHOST_POSITIONS)
+    benchmarks['ga.evaluate_population.100'] = \
+        lambda: lambda: ga.evaluate_population(game, ga.population, a_star_path, GHOST_POSITIONS)
+
+    scan_game = SimpleNamespace(player=game.player)  # No pellet index: get_target scans the map
+    benchmarks['get_target.index'] = lambda: lambda: ga.get_target(game)
+    benchmarks['get_target.scan'] = lambda: lambda: ga.get_target(scan_game)
+    benchmarks['pellet_index.rebuild'] = lambda: game.pellet_index.rebuild
+
+    # The ghosts' shortest-path searches: one BFS field per goal, then batched steps
+    navigator = GhostNavigator(graph)
+    navigator.next_hop_table()  # Built once per map in a game, not per step
+    benchmarks['ghosts.build_field'] = lambda: lambda: navigator.build_field(graph.tile_id(start))
+    benchmarks['ghosts.path'] = lambda: lambda: navigator.path(far, start)
+
+    # Ghost steps move the ghosts: every run respawns them at home
+    def ghost_step(count):
+        ghosts = GhostSystem(graph, navigator)
+        names = list(homes)
+        for index in range(count):
+            ghosts.spawn(names[index % len(names)], *homes[names[index % len(names)]])
+        return lambda: ghosts.step(game.player)
+    for label, count in (('4', 4), ('swarm.100', 100)):
+        benchmarks[f'ghosts.step.{label}'] = lambda count=count: ghost_step(count)
+    return benchmarks
+
+
+def time_case(factory, repeats, min_time):
+    """
+    Median seconds per call over repeats runs of as many calls as take min_time.
+    Every run times a fresh factory() after one untimed warm-up call.
+    """
+    function = factory()
+    function()  # Warm up: lookup tables and buffers built on the first call are not timed
+    number = 1
+    while True:
+        begin = time.perf_counter()
+        for _ in range(number):
+            function()
+        if time.perf_counter() - begin >= min_time:
+            break
+        number *= 2
+    runs = []
+    for _ in range(repeats):
+        function = factory()
+        function()
+        begin = time.perf_counter()
+        for _ in range(number):
+            function()
+        runs.append((time.perf_counter() - begin) / number)
+    runs.sort()
+    return runs[len(runs) // 2], number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--output', default=None, help='Write the results to this JSON file (e.g. a new baseline)')
+    parser.add_argument('--baseline', default=None, help='Compare against the results saved in this JSON file')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='Slowdown over the baseline that counts as a regression (0.25 = 25%%)')
+    parser.add_argument('--cases', nargs='+', default=None, help='Only run cases starting with these names')
+    parser.add_argument('--repeats', type=int, default=7)
+    parser.add_argument('--min-time', type=float, default=0.05, help='Seconds each repeat runs for at least')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)['results']
+
+    results = {}
+    regressions = []
+    print(f"{'case':<34} {'us/call':>11} {'calls':>7} {'baseline':>11} {'change':>8}")
+    for name, factory in cases(args.seed).items():
+        if args.cases and not any(name.startswith(prefix) for prefix in args.cases):
+            continue
+        seconds, number = time_case(factory, args.repeats, args.min_time)
+        results[name] = seconds * 1e6
+        line = f"{name:<34} {results[name]:>11.2f} {number:>7}"
+        if baseline is not None and name in baseline:
+            change = results[name] / baseline[name] - 1
+            line += f" {baseline[name]:>11.2f} {change:>+7.0%}"
+            if change > args.threshold:
+                regressions.append(name)
+                line += '  REGRESSION'
+        print(line)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'seed': args.seed, 'unit': 'us/call', 'results': results}, f, indent=2)
+    if regressions:
+        print(f"{len(regressions)} regression(s) over {args.threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -8,6 +8,7 @@ ENEMY_LAYER = 4
 BLOCK_LAYER = 5
 GROUND_LAYER = 1
 FPS = 60
+SIMULATION_SPEEDS = [1, 4, 16, None]  # World ticks per rendered frame; None runs as many as fit in a frame
 
 # Colors
 WHITE = (255, 255, 255)
@@ -0,0 +1,195 @@
+# ghosts.py
+import numpy as np
+from config import *
+
+
+def chase_target(player, graph):
+    """Blinky: directly target the player's current tile."""
+    return player.tile_x, player.tile_y
+
+
+def ambush_target(player, graph):
+    """Pinky: target four tiles ahead of the player's direction."""
+    dx, dy = player.direction
+    return player.tile_x + dx * 4, player.tile_y + dy * 4
+
+
+def flank_target(player, graph):
+    """Inky: target a tile diagonally offset from the player by two tiles."""
+    radius = 2  # Offset distance from player
+    offset_x = radius if player.direction[0] >= 0 else -radius
+    offset_y = radius if player.direction[1] >= 0 else -radius
+    return player.tile_x + offset_x, player.tile_y + offset_y
+
+
+# Targeting rule of each classic ghost; Clyde chases the player like Blinky
+GHOST_STRATEGIES = {
+    'blinky': chase_target,
+    'pinky': ambush_target,
+    'inky': flank_target,
+    'clyde': chase_target,
+}
+
+
+class GhostSystem:
+    """
+    Struct-of-arrays ghost simulation: every ghost is a row in a set of
+    arrays (tile, pixel position, target tile, goal, strategy id, speed) and
+    all ghosts advance in one batched step per tick.
+
+    Each ghost commits to the goal its strategy picks and walks a shortest
+    path to it, one tile at a time, using the navigator's next-hop table.
+    Once it reaches the goal, or if the goal is a wall, it asks its strategy
+    again. Strategies are functions (player, graph) -> goal tile; pass a
+    different mapping to plug in new ones.
+
+    hash is the Zobrist hash of the ghosts' tiles, updated as they move.
+    occupancy counts, per tile id, the ghosts standing on or moving into
+    that tile, so "is a ghost here?" is one lookup; standing counts only the
+    ghosts standing on it (the tiles positions() reports).
+    """
+    def __init__(self, graph, navigator, strategies=None, capacity=4):
+        self.graph = graph
+        self.navigator = navigator
+        self.strategies = dict(GHOST_STRATEGIES if strategies is None else strategies)
+        self.strategy_names = list(self.strategies)
+        self.count = 0
+        self.hash = 0
+        self.occupancy = np.zeros(graph.size, dtype=np.int32)
+        self.standing = np.zeros(graph.size, dtype=np.int32)
+        self.allocate(capacity)
+
+    def allocate(self, capacity):
+        """(Re)size the arrays, keeping the existing ghosts."""
+        arrays = {
+            'strategy': np.int16, 'speed': np.float64,
+            'tile': np.intp, 'target': np.intp, 'goal': np.intp, 'moving': bool,
+            'x': np.float64, 'y': np.float64, 'rect_x': np.int64, 'rect_y': np.int64,
+        }
+        for name, dtype in arrays.items():
+            array = np.zeros(capacity, dtype=dtype)
+            if hasattr(self, name):
+                array[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, array)
+        self.capacity = capacity
+        self.keys = self.graph.zobrist.ghost_keys(capacity)
+
+    def clear(self):
+        self.count = 0
+        self.hash = 0
+        self.occupancy[:] = 0
+        self.standing[:] = 0
+
+    def __len__(self):
+        return self.count
+
+    def spawn(self, strategy, x, y, speed=GHOST_SPEED):
+        """Add a ghost using the named strategy at tile (x, y)."""
+        if self.count == self.capacity:
+            self.allocate(self.capacity * 2)
+        i = self.count
+        self.count += 1
+        self.strategy[i] = self.strategy_names.index(strategy)
+        self.speed[i] = speed
+        self.tile[i] = self.graph.tile_id((x, y))
+        self.hash ^= int(self.keys[i, self.tile[i]])
+        self.occupancy[self.tile[i]] += 1
+        self.standing[self.tile[i]] += 1
+        self.target[i] = self.tile[i]
+        self.goal[i] = -1  # No goal yet: ask the strategy on the first step
+        self.moving[i] = False
+        self.x[i], self.y[i] = x * TILESIZE, y * TILESIZE
+        self.rect_x[i], self.rect_y[i] = x * TILESIZE, y * TILESIZE
+
+    def positions(self):
+        """Tile position of every ghost."""
+        width = self.graph.width
+        return [(tile % width, tile // width) for tile in self.tile[:self.count].tolist()]
+
+    def sprites(self):
+        """(strategy name, pixel x, pixel y) of every ghost, for rendering."""
+        return [(self.strategy_names[strategy], x, y) for strategy, x, y in
+                zip(self.strategy[:self.count].tolist(), self.rect_x[:self.count].tolist(),
+                    self.rect_y[:self.count].tolist())]
+
+    def near(self, rect):
+        """
+        True if a ghost occupies any tile around the one rect is closest to.
+        A ghost overlapping rect is always within one tile of it on both axes.
+        """
+        x, y = round(rect.x / TILESIZE), round(rect.y / TILESIZE)
+        grid = self.occupancy.reshape(self.graph.height, self.graph.width)
+        return bool(grid[max(0, y - 1):y + 2, max(0, x - 1):x + 2].any())
+
+    def collides(self, rect):
+        """True if any ghost's tile-sized rect overlaps rect."""
+        if not self.near(rect):
+            return False  # Constant-time answer for the common case
+        n = self.count
+        return bool(np.any((self.rect_x[:n] < rect.right) & (self.rect_x[:n] + TILESIZE > rect.left) &
+                           (self.rect_y[:n] < rect.bottom) & (self.rect_y[:n] + TILESIZE > rect.top)))
+
+    def strategy_goals(self, player):
+        """Goal tile id chosen by each strategy this tick (-1 if it is not walkable)."""
+        goals = np.empty(len(self.strategy_names), dtype=np.intp)
+        for index, name in enumerate(self.strategy_names):
+            x, y = self.strategies[name](player, self.graph)
+            # Clamp the goal to the tilemap boundaries
+            x = max(0, min(self.graph.width - 1, x))
+            y = max(0, min(self.graph.height - 1, y))
+            goals[index] = self.graph.tile_id((x, y)) if self.graph.is_walkable((x, y)) else -1
+        return goals
+
+    def step(self, player):
+        """Advance every ghost by one tick."""
+        n = self.count
+        if n == 0:
+            return
+        idle = np.flatnonzero(~self.moving[:n])
+
+        # Moving ghosts glide towards their target tile
+        moving = np.flatnonzero(self.moving[:n])
+        if moving.size:
+            target_x = (self.target[moving] % self.graph.width) * TILESIZE
+            target_y = (self.target[moving] // self.graph.width) * TILESIZE
+            dx = target_x - self.x[moving]
+            dy = target_y - self.y[moving]
+            distance = np.hypot(dx, dy)
+            speed = self.speed[moving]
+            scale = np.divide(speed, distance, out=np.zeros_like(distance), where=distance > 0)
+            x = self.x[moving] + dx * scale
+            y = self.y[moving] + dy * scale
+            rect_x, rect_y = np.round(x), np.round(y)
+
+            # Snap to the target tile if close enough
+            arrived = (np.abs(dx) < speed) & (np.abs(dy) < speed)
+            x[arrived] = rect_x[arrived] = target_x[arrived]
+            y[arrived] = rect_y[arrived] = target_y[arrived]
+            self.x[moving], self.y[moving] = x, y
+            self.rect_x[moving], self.rect_y[moving] = rect_x, rect_y
+            done = moving[arrived]
+            if done.size:
+                self.hash ^= int(np.bitwise_xor.reduce(self.keys[done, self.tile[done]] ^ self.keys[done, self.target[done]]))
+                np.subtract.at(self.occupancy, self.tile[done], 1)  # Left the old tile
+                np.subtract.at(self.standing, self.tile[done], 1)
+                np.add.at(self.standing, self.target[done], 1)
+            self.tile[done] = self.target[done]
+            self.moving[done] = False
+
+        # Idle ghosts that reached their goal (or have none) pick a new one, then take the next step
+        if idle.size:
+            tiles = self.tile[idle]
+            replan = (self.goal[idle] < 0) | (self.goal[idle] == tiles)
+            if replan.any():
+                self.goal[idle[replan]] = self.strategy_goals(player)[self.strategy[idle[replan]]]
+            goals = self.goal[idle]
+            next_tiles = np.where(goals >= 0, self.navigator.next_hop_table()[goals, tiles], -1)
+            go = next_tiles >= 0
+            self.target[idle[go]] = next_tiles[go]
+            self.moving[idle[go]] = True
+            np.add.at(self.occupancy, next_tiles[go], 1)  # Entering the next tile
+            self.goal[idle[~go]] = -1  # Unreachable goal: ask again next tick
+
+    def draw(self, surface, images):
+        """Blit every ghost with the image of its strategy; returns the areas drawn."""
+        return surface.blits([(images[name], (x, y)) for name, x, y in self.sprites()])
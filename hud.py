@@ -0,0 +1,39 @@
+# hud.py
+import pygame
+from collections import OrderedDict
+
+_fonts = {}
+
+
+def get_font(size, name=None):
+    """Shared font of the given size, loaded on first use."""
+    font = _fonts.get((name, size))
+    if font is None:
+        font = _fonts[(name, size)] = pygame.font.Font(name, size)
+    return font
+
+
+class TextCache:
+    """
+    Rendered text surfaces keyed on (text, font, color).
+
+    A label is only rendered again when its text changes, so the timer costs
+    one render per second and static labels one render in total. The cache
+    is a bounded LRU so ever-changing values (scores) do not pile up.
+    """
+    def __init__(self, max_size=128):
+        self.max_size = max_size
+        self.surfaces = OrderedDict()
+        self.renders = 0  # Surfaces rendered so far
+
+    def render(self, text, font, color):
+        key = (text, font, color)
+        surface = self.surfaces.get(key)
+        if surface is None:
+            surface = self.surfaces[key] = font.render(text, True, color)
+            self.renders += 1
+            if len(self.surfaces) > self.max_size:
+                self.surfaces.popitem(last=False)
+        else:
+            self.surfaces.move_to_end(key)
+        return surface
@@ -1,8 +1,10 @@
 # main.py
 import pygame
 from config import *
-from config import TilemapManager
 from object import *
+from world import World
+from hud import TextCache, get_font
+from profiler import Profiler
 import sys
 import time
 import matplotlib.pyplot as plt
@@ -10,7 +12,7 @@ import matplotlib.pyplot as plt
 
 # Game Class to encapsulate all game logic
 class Game:
-    def __init__(self):
+    def __init__(self, seed=None):
         pygame.init()
         
         # Set up the screen
@@ -20,84 +22,196 @@ class Game:
         # Clock to control the frame rate
         self.clock = pygame.time.Clock()
         
-        # Create sprite groups
-        self.all_sprites = pygame.sprite.Group()
-        self.enemies = pygame.sprite.Group()
+        # Sprite groups: the static map is pre-rendered into the background, only moving sprites are redrawn
+        self.all_sprites = pygame.sprite.RenderUpdates()
         self.blocks = pygame.sprite.Group()
         self.pellets = pygame.sprite.Group()
+        self.pellet_sprites = {}  # Tile -> Pellet sprite still drawn on the background
+        self.pellet_pool = {}  # Tile -> Pellet sprite of every pellet on the map, built once
+        self.level_background = None  # The map as a level starts, rendered once
+        self.background = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+        self.ghost_rects = []  # Screen areas the ghosts covered last frame
+        self.text_cache = TextCache()  # Labels are only re-rendered when their text changes
+        self.back_button = pygame.Rect(10, SCREEN_HEIGHT - 60, 100, 40)
+        self.hud_rect = pygame.Rect(len(original_tilemap[0]) * TILESIZE, 0,
+                                    SCREEN_WIDTH - len(original_tilemap[0]) * TILESIZE, 170)  # Redrawn every frame
+        self.speed = 0  # Index into SIMULATION_SPEEDS, cycled with Tab
+        self.profiler = None  # Profiler while F3 profiling is on; None costs nothing
+        self.profile_path = 'profile.json'  # Report written when profiling stops (.json or .csv)
+        self.profile_rows = []  # Overlay rows, refreshed twice a second
+        map_height = len(original_tilemap) * TILESIZE
+        self.profile_rect = pygame.Rect(130, map_height + 4, SCREEN_WIDTH - 140, SCREEN_HEIGHT - map_height - 8)
 
         self.levels = 0
         self.current_level = 1
+        self.difficulty = 'easy'
         self.pellet_count = 0
         self.score = 0 # score for each level
         self.total_score = 0 # score total from each game
-        self.start_time = time.time()
-        self.total_elapsed_time = 0
-        self.collision_cooldown_duration = 1.0  # 1 second cooldown
-        self.last_collision_time = 0  # Last time a collision occurred
-
-        self.tilemap = TilemapManager.tilemap
-        self.a_star = AStarAlgorithm(self.tilemap)  # Initialize AStarAlgorithm
-        self.ga = GeneticAlgorithm(
-            population_size=100, chromosome_length=50, mutation_rate=0.1, tilemap=self.tilemap
-        )
+        self.total_elapsed_time = 0  # Simulated seconds of the levels played this session
 
-    def reset_tilemap(self):
-        """Restore the tilemap to its original state."""
-        global tilemap
-        tilemap = [list(row) for row in original_tilemap]
-        TilemapManager.tilemap = tilemap
+        # Headless simulation this window renders
+        # Seeded games evolve in lockstep with the ticks at every speed, so a seed always replays the same game
+        self.seed = seed
+        self.world = World(headless=False, verbose=True, background_planner=True, seed=seed)
+        self.tilemap = self.world.tilemap
+        self.ga = self.world.ga
+        self.ghost_images = {name: load_image(self.world, f'assets/{name}.png') for name in self.world.ghosts.strategies}
 
-    def count_total_pellets(self):
-        total_pellets = 0
-        for row in tilemap:
-            total_pellets += row.count('.')  # Count pellets represented by '.'
-        return total_pellets
+    @property
+    def player(self):
+        return self.world.player
 
     # Initialize game elements
     def init_game(self):
-        self.reset_tilemap()
-        self.all_sprites.empty()
-        self.enemies.empty()
-        self.blocks.empty()
-        self.pellets.empty()
+        """
+        Start a level. The sprites and the background of the map are built on
+        the first level only; later levels restore them in place.
+        """
+        self.world.difficulty = self.difficulty
+        self.apply_speed()
+        self.world.start_level()
         self.score = 0
-        self.start_time = time.time()
 
-        self.pellet_count = self.count_total_pellets()  # Get the total pellet count
+        self.pellet_count = self.world.pellet_count  # Get the total pellet count
         print(f"Total pellets: {self.pellet_count}")  # Print total for verification
 
-        for row_index, row in enumerate(tilemap):
+        if self.level_background is None:
+            self.build_level()
+        self.pellets.add(self.pellet_pool.values())  # Bring back the pellets eaten last level
+        self.pellet_sprites.clear()
+        self.pellet_sprites.update(self.pellet_pool)
+
+        # Moving sprites are drawn on top of the map
+        self.all_sprites.add(self.world.all_sprites)
+        self.background.blit(self.level_background, (0, 0))
+        self.ghost_rects = []
+        self.eaten_rects = []  # Pellets eaten since the last frame was drawn
+
+    def build_level(self):
+        """Create the wall and pellet sprites of the map and render its background."""
+        for row_index, row in enumerate(self.tilemap):
             for col_index, tile in enumerate(row):
                 if tile == 'W':
                     Block(self, col_index, row_index)  # Walls/Blocks
-                elif tile == 'P':
-                    self.player = Player(self, col_index, row_index)  # Pac-Man Player
-                elif tile == 'R':
-                    self.blinky = Blinky(self, col_index, row_index)  # Red Ghost Enemy
-                    self.enemies.add(self.blinky)
-                elif tile == 'L' and self.difficulty in ['medium' ,'hard', 'very_hard']:
-                    self.pinky = Pinky(self, col_index, row_index)  # Pink Ghost Enemy
-                    self.enemies.add(self.pinky)
-                elif tile == 'I' and self.difficulty in ['hard', 'very_hard']:
-                    self.inky = Inky(self, col_index, row_index)  # Cyan Ghost Enemy
-                    self.enemies.add(self.inky)
-                elif tile == 'C' and self.difficulty == 'very_hard':
-                    self.clyde = Clyde(self, col_index, row_index)  # Orange Ghost Enemy
-                    self.enemies.add(self.clyde)
                 elif tile == '.':
-                    Pellet(self, col_index, row_index)  # Pellets
-                elif tile == ' ':
-                    Ground(self, col_index, row_index)  # Ground
-
-        self.all_sprites.add(self.player)
-        self.all_sprites.add(self.enemies)
-        self.all_sprites.add(self.blocks)
-        self.all_sprites.add(self.pellets)
+                    self.pellet_pool[(col_index, row_index)] = Pellet(self, col_index, row_index)  # Pellets
+        self.level_background = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+        self.draw_background(self.level_background)
+
+    def simulate_frame(self):
+        """
+        Advance the world by this frame's share of fixed ticks: the speed
+        multiplier's worth, or as many as fit in one frame at unlimited
+        speed. Rendering never changes how far a tick moves anything.
+        Returns True once the level is cleared.
+        """
+        ticks = SIMULATION_SPEEDS[self.speed]
+        deadline = time.perf_counter() + 1 / FPS if ticks is None else None
+        ran = 0
+        while ticks is None or ran < ticks:
+            ran += 1
+            level_cleared = self.world.step()  # Player, genetic algorithm and ghosts
+            # Pellets disappear once Pac-Man touches them; scoring happens in the world
+            for pellet in self.touched_pellets():
+                self.background.fill(BLACK, pellet.rect)
+                self.eaten_rects.append(pellet.rect)  # Fast-forwarded frames skip past them
+            if level_cleared or (deadline is not None and time.perf_counter() >= deadline):
+                break
+        return level_cleared
+
+    def draw_sprites(self):
+        """
+        Restore the background under last frame's moving sprites and the pellets
+        eaten since, then draw the sprites at their new places. Returns the dirty rects.
+        """
+        self.all_sprites.clear(self.screen, self.background)
+        for rect in self.ghost_rects + self.eaten_rects:
+            self.screen.blit(self.background, rect, rect)
+        dirty = self.all_sprites.draw(self.screen) + self.ghost_rects + self.eaten_rects
+        self.eaten_rects = []
+        self.ghost_rects = self.world.ghosts.draw(self.screen, self.ghost_images)
+        return dirty + self.ghost_rects
+
+    def toggle_profiler(self):
+        """Start profiling with its overlay, or stop and write the report."""
+        if self.profiler is None:
+            self.profiler = Profiler()
+            self.world.set_profiler(self.profiler)
+            self.profile_rows = []
+        else:
+            self.stop_profiler()
+
+    def stop_profiler(self):
+        if self.profiler is not None:
+            self.world.set_profiler(None)
+            self.profiler.dump(self.profile_path)
+            print(f"Profile written to {self.profile_path}")
+            self.profiler = None
+            self.screen.blit(self.background, self.profile_rect, self.profile_rect)
+
+    def draw_profile(self):
+        """Overlay the slowest stages' p50/p95/p99 below the map. Returns the dirty rect."""
+        if self.world.level_ticks % (FPS // 2) == 0 or not self.profile_rows:
+            self.profile_rows = self.profiler.report()
+        self.screen.blit(self.background, self.profile_rect, self.profile_rect)
+        font = get_font(22)
+        rect = self.profile_rect
+        rows = [('stage', 'p50 ms', 'p95 ms', 'p99 ms')] + [
+            (row['stage'], f"{row['p50_ms']:.2f}", f"{row['p95_ms']:.2f}", f"{row['p99_ms']:.2f}")
+            for row in self.profile_rows]
+        for index, cells in enumerate(rows[:rect.height // 17]):
+            y = rect.top + index * 17
+            self.screen.blit(self.text_cache.render(cells[0], font, YELLOW), (rect.left, y))
+            for column, cell in enumerate(cells[1:], 1):
+                surface = self.text_cache.render(cell, font, YELLOW)
+                self.screen.blit(surface, surface.get_rect(topright=(rect.left + 130 + column * 90, y)))
+        return rect
+
+    def apply_speed(self):
+        """
+        The background planner runs on wall-clock time, so at any speed but 1x
+        (and for seeded games) its GA evolves in lockstep with the ticks
+        instead: outcomes then do not depend on the speed. Either way Pac-Man
+        follows the same GA, so Tab hands over its evolved population.
+        """
+        self.world.set_lockstep(self.seed is not None or SIMULATION_SPEEDS[self.speed] != 1)
+
+    def speed_label(self):
+        ticks = SIMULATION_SPEEDS[self.speed]
+        return "Speed: max" if ticks is None else f"Speed: {ticks}x"
+
+    def touched_pellets(self):
+        """
+        Remove and return the pellet sprites Pac-Man's rect overlaps. Only the
+        (at most four) tiles under the rect are looked up.
+        """
+        rect = self.player.rect
+        touched = []
+        for x in {rect.left // TILESIZE, (rect.right - 1) // TILESIZE}:
+            for y in {rect.top // TILESIZE, (rect.bottom - 1) // TILESIZE}:
+                pellet = self.pellet_sprites.get((x, y))
+                if pellet is not None and pellet.rect.colliderect(rect):
+                    del self.pellet_sprites[(x, y)]
+                    pellet.kill()
+                    touched.append(pellet)
+        return touched
+
+    def draw_background(self, surface):
+        """
+        Render the walls, the pellets and the back button once per map.
+        Frames only restore the background where something moved.
+        """
+        surface.fill(BLACK)
+        self.blocks.draw(surface)
+        self.pellets.draw(surface)
+        pygame.draw.rect(surface, WHITE, self.back_button)
+        self.draw_text("Back", get_font(36), BLACK, surface,
+                       self.back_button.centerx, self.back_button.centery)
 
     def new_level_screen(self):
-        font_large = pygame.font.Font(None, 74)  # Font for the main level message
-        font_small = pygame.font.Font(None, 36)  # Font for the score details
+        font_large = get_font(74)  # Font for the main level message
+        font_small = get_font(36)  # Font for the score details
         
         # Fill screen with background color
         self.screen.fill(BLACK)
@@ -143,16 +257,16 @@ class Game:
 
     def draw_text(self, text, font, color, surface, x, y):
         """Helper function to draw text on screen."""
-        text_obj = font.render(text, True, color)
+        text_obj = self.text_cache.render(text, font, color)
         text_rect = text_obj.get_rect(center=(x, y))
         surface.blit(text_obj, text_rect)
 
         
     def intro_screen(self):
-        font = pygame.font.Font(None, 74)
-        message_font = pygame.font.Font(None, 50)
-        button_font = pygame.font.Font(None, 36)
-        input_font = pygame.font.Font(None, 36)
+        font = get_font(74)
+        message_font = get_font(50)
+        button_font = get_font(36)
+        input_font = get_font(36)
         
         # Input field setup
         input_box = pygame.Rect(SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT // 2 + 320, 200, 40)
@@ -183,10 +297,10 @@ class Game:
             pygame.draw.rect(self.screen, WHITE, input_box, 2 if input_active else 1)
             if input_text:
                 # Display user-entered text
-                input_surface = input_font.render(input_text, True, WHITE)
+                input_surface = self.text_cache.render(input_text, input_font, WHITE)
             else:
                 # Display placeholder text
-                input_surface = input_font.render(placeholder_text, True, GRAY)
+                input_surface = self.text_cache.render(placeholder_text, input_font, GRAY)
             self.screen.blit(input_surface, (input_box.x + 5, input_box.y + 5))
             
             for event in pygame.event.get():
@@ -247,6 +361,9 @@ class Game:
                         elif event.key == pygame.K_4:
                             self.difficulty = 'very_hard'
                             return 'intro'
+                        elif event.key == pygame.K_5:
+                            self.difficulty = 'swarm'  # Stress test with world.swarm_size ghosts
+                            return 'intro'
 
             pygame.display.flip()
             self.clock.tick(60)
@@ -254,9 +371,9 @@ class Game:
     # Game Over Screen
     def game_over_screen(self, status, final_score, elapsed_time):
 
-        font = pygame.font.Font(None, 74)
-        score_font = pygame.font.Font(None, 36)
-        button_font = pygame.font.Font(None, 50)
+        font = get_font(74)
+        score_font = get_font(36)
+        button_font = get_font(50)
 
         # Define the Show Chart button rectangle
         show_chart_button = pygame.Rect(SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT // 2 + 100, 200, 50)
@@ -315,26 +432,43 @@ class Game:
 
     # Main game loop
     def game_loop(self):
-        self.init_game()
+        """
+        Play the chosen levels. Whichever way the game ends, the world's
+        planner is stopped and a running profile is written and removed.
+        """
+        try:
+            return self.play_levels()
+        finally:
+            self.stop_profiler()
+            self.world.stop()
+
+    def play_levels(self):
+        self.score = 0
         self.total_score = 0
-        self.start_time = time.time()  # Record the start time
         self.current_level = 1
-        back_button = pygame.Rect(10, SCREEN_HEIGHT - 60, 100, 40)
+        back_button = self.back_button
 
         while self.current_level <= self.levels:
             self.new_level_screen()
             self.init_game()
-            a_star_path = None
-            level_start_time = time.time()
+            self.screen.blit(self.background, (0, 0))
+            pygame.display.flip()
 
             while True:
-                self.screen.fill(BLACK)
-                self.all_sprites.update(self)  # Update all sprites
-                self.all_sprites.draw(self.screen)  # Draw all sprites
-
-             # Run genetic algorithm for each frame or at specific intervals
-                if hasattr(self, 'ga'):
-                    best_chromosome = self.ga.evolve(self, a_star_path)  # Ensure this runs
+                profiler = self.profiler
+                if profiler is not None:
+                    profiler.start_frame()
+                level_cleared = self.simulate_frame()
+                self.score = self.world.score
+                self.pellet_count = self.world.pellet_count
+                if profiler is not None:
+                    profiler.lap('simulate')
+
+                dirty = self.draw_sprites()
+                self.screen.blit(self.background, self.hud_rect, self.hud_rect)
+                dirty.append(self.hud_rect)
+                if profiler is not None:
+                    profiler.lap('draw')
 
                 for event in pygame.event.get():
                     if event.type == pygame.QUIT:
@@ -345,55 +479,43 @@ class Game:
                             return False # Exit the game loop and return to intro screen    
                     if event.type == pygame.KEYDOWN and event.key == pygame.K_BACKSPACE:
                         return False
-
-                # Call each enemy's move method
-                if hasattr(self, 'blinky'):
-                    self.blinky.move()
-                if hasattr(self, 'pinky'):
-                    self.pinky.move()
-                if hasattr(self, 'inky'):
-                    self.inky.move()
-                if hasattr(self, 'clyde'):
-                    self.clyde.move()
-
-
-                # Calculate elapsed time for the timer
-                elapsed_time = int(time.time() - self.start_time)
+                    if event.type == pygame.KEYDOWN and event.key == pygame.K_TAB:
+                        self.speed = (self.speed + 1) % len(SIMULATION_SPEEDS)  # Fast-forward
+                        self.apply_speed()
+                    if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                        self.toggle_profiler()
+                        dirty.append(self.profile_rect)
+                if profiler is not None:
+                    profiler.lap('events')
+
+                # Simulated time: the clock runs with the world, not with the frame rate
+                elapsed_time = int(self.total_elapsed_time + self.world.time)
                 hours = elapsed_time // 3600
                 minutes = (elapsed_time % 3600) // 60
                 seconds = elapsed_time % 60
                 timer_text = f"Time: {hours:02}:{minutes:02}:{seconds:02}"
 
                 # Display the score on the screen
-                font = pygame.font.Font(None, 36)
+                font = get_font(36)  # Created once, shared by every frame
                 self.draw_text(f"Score: {self.score}", font, WHITE, self.screen, SCREEN_WIDTH - 100, 30)
                 self.draw_text(timer_text, font, WHITE, self.screen, SCREEN_WIDTH - 100, 60)
 
-                # Draw the back button
-                pygame.draw.rect(self.screen, WHITE, back_button)
-                self.draw_text("Back", font, BLACK, self.screen, back_button.centerx, back_button.centery)
-
-                # Handling collisions with enemies
-                if pygame.sprite.spritecollideany(self.player, self.enemies):
-                    elapsed_time = time.time() - self.start_time  # Calculate elapsed time
-                    current_time = time.time()
-                    # technically IFrames
-                    if current_time - self.last_collision_time >=  self.collision_cooldown_duration:
-                        self.score -= 500  # Deduct points on collision
-                        self.last_collision_time = current_time  # Update last collision time
-
-                # Update score and pellet count
-                collected_pellets = pygame.sprite.spritecollide(self.player, self.pellets, True)
-                if collected_pellets:
-                    self.pellet_count -= len(collected_pellets)
-                    self.score += len(collected_pellets) * 100  # Add collected pellets to score
-                    # print(f"Collected pellets: {len(collected_pellets)}, Remaining pellets: {self.pellet_count}")
+                # Background planner health: how stale the followed plan is and how fast the GA runs
+                planner = self.world.planner
+                if planner is not None and planner.latest() is not None:
+                    self.draw_text(f"Plan age: {planner.plan_age() * 1000:.0f} ms", font, WHITE, self.screen, SCREEN_WIDTH - 110, 90)
+                    self.draw_text(f"GA: {planner.generations_per_second:.0f} gen/s", font, WHITE, self.screen, SCREEN_WIDTH - 110, 120)
+                self.draw_text(self.speed_label(), font, WHITE, self.screen, SCREEN_WIDTH - 110, 150)
+                if self.profiler is not None:
+                    dirty.append(self.draw_profile())
+                if profiler is not None:
+                    profiler.lap('hud')
 
                 # Check if level is completed
-                if self.pellet_count <= 0:
+                if level_cleared:
                     # Update total score and print level stats
                     self.total_score += self.score
-                    level_elapsed_time = time.time() - level_start_time
+                    level_elapsed_time = self.world.time
                     self.total_elapsed_time += level_elapsed_time
 
                     # Print level completion details to the terminal
@@ -403,6 +525,7 @@ class Game:
                     print(f"Time Taken for Level {self.current_level}: {level_elapsed_time:.2f} seconds")
                     print(f"Total Time of Game Session: {self.total_elapsed_time:.2f}")
 
+                    self.world.stop()  # No planning while the level screen shows
                     self.new_level_screen()
                     # Move to the next level
                     self.score = 0  # Reset the level score for the next level
@@ -411,11 +534,17 @@ class Game:
 
 
 
-                pygame.display.flip()
+                pygame.display.update(dirty)
+                if profiler is not None:
+                    profiler.lap('present')
                 self.clock.tick(FPS)
+                if profiler is not None:
+                    profiler.lap('wait')
+                    profiler.end_frame()
 
             # Calculate final elapsed time
         final_elapsed_time = self.total_elapsed_time
+        self.stop_profiler()
 
         # Game over screen
         self.game_over_screen('win', self.total_score, final_elapsed_time)
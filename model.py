@@ -1,28 +1,301 @@
 import heapq
 import random
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 import matplotlib.pyplot as pl
+from navigation import MOVES, MOVE_INDEX, navigation_graph
+
+
+# Chromosomes are uint8 arrays of gene values, each an index into MOVES
+GENE_DTYPE = np.uint8
+
+
+def encode_population(population):
+    """
+    Stack a population of gene arrays into a gene matrix (one row per chromosome).
+    """
+    return np.asarray(population, dtype=GENE_DTYPE).reshape(len(population), -1)
+
+
+class BatchFitnessEvaluator:
+    """
+    Evaluates a whole population at once with array operations.
+    Produces exactly the scores of GeneticAlgorithm.evaluate_fitness_without_adversarial
+    (and AdversarialAlgorithm.evaluate_fitness), one gene column at a time.
+    """
+    def __init__(self, tilemap):
+        self.tilemap = tilemap
+        self.graph = navigation_graph(tilemap)
+        self.width = self.graph.width
+        self.height = self.graph.height
+        self.size = self.graph.size
+        self.transitions = self.graph.transition_array  # Tile reached by each move from each tile
+
+    def pellet_mask(self):
+        return np.fromiter((tile == '.' for row in self.tilemap for tile in row), dtype=bool, count=self.size)
+
+    def enemy_mask(self, ghost_positions):
+        """
+        Tiles within Manhattan distance 1 of any ghost.
+        """
+        near = np.zeros(self.size, dtype=bool)
+        for ghost_x, ghost_y in ghost_positions:
+            for dx, dy in [(0, 0), (0, 1), (1, 0), (0, -1), (-1, 0)]:
+                x, y = ghost_x + dx, ghost_y + dy
+                if 0 <= x < self.width and 0 <= y < self.height:
+                    near[y * self.width + x] = True
+        return near
+
+    def path_directions(self, a_star_path, start, get_direction):
+        """
+        Move index needed to take each step of the A* path (-1 if no single move does),
+        followed by a sentinel that no gene matches once the path is exhausted.
+        """
+        directions = []
+        position = start
+        for next_position in a_star_path:
+            direction = get_direction(position, next_position)
+            directions.append(MOVE_INDEX[direction] if direction else -1)
+            position = next_position
+        directions.append(-2)
+        return np.array(directions, dtype=np.int8)
+
+    def prepare(self, start, a_star_path, ghost_positions, get_direction, pellets=None):
+        """
+        World state shared by every chromosome of a generation:
+        pellet mask, ghost proximity mask and A* path directions.
+        The pellet mask is read from the tilemap unless one is given.
+        """
+        if pellets is None:
+            pellets = self.pellet_mask()
+        return pellets, self.enemy_mask(ghost_positions), self.path_directions(a_star_path, start, get_direction)
+
+    def evaluate(self, genes, start, a_star_path, ghost_positions, get_direction, pellets=None):
+        """
+        Return the fitness vector for a gene matrix starting from the start tile.
+        """
+        return self.evaluate_genes(genes, start, *self.prepare(start, a_star_path, ghost_positions, get_direction, pellets))
+
+    def evaluate_genes(self, genes, start, pellets, near_enemy, directions):
+        """
+        Score a gene matrix against prepared world state.
+        """
+        population_size, chromosome_length = genes.shape
+        rows = np.arange(population_size)
+        path_length = len(directions) - 1  # Without the sentinel
+
+        scores = np.zeros(population_size, dtype=np.int64)
+        position = np.full(population_size, start[1] * self.width + start[0], dtype=np.intp)
+        visited = np.zeros((population_size, self.size), dtype=bool)
+        path_index = np.zeros(population_size, dtype=np.intp)
+
+        for i in range(chromosome_length):
+            move = genes[:, i]
+            position = self.transitions[position, move]
+
+            # Revisits are penalised; first visits collect pellets and ghost penalties
+            revisited = visited[rows, position]
+            visited[rows, position] = True
+            scores -= 500 * revisited
+            first_visit = ~revisited
+            scores += 2500 * (first_visit & pellets[position])
+            scores -= 1000 * (first_visit & near_enemy[position])
+
+            # Reward for following the A* path closely
+            on_path = path_index < path_length
+            follows = on_path & (move == directions[path_index])
+            scores += np.where(on_path, np.where(follows, 100, -50), -20)
+            path_index += follows
+
+        return scores
+
+
+_worker_evaluator = None  # BatchFitnessEvaluator of a ParallelFitnessEvaluator worker process
+
+
+def _init_worker(tilemap):
+    global _worker_evaluator
+    _worker_evaluator = BatchFitnessEvaluator(tilemap)
+
+
+def _evaluate_shard(genes, start, pellets, near_enemy, directions):
+    return _worker_evaluator.evaluate_genes(genes, start, pellets, near_enemy, directions)
+
+
+class ParallelFitnessEvaluator(BatchFitnessEvaluator):
+    """
+    Shards large populations across a process pool.
+    Workers receive the map topology once when they start and the pellet,
+    ghost and path state once per generation with their shard of genes.
+    Populations smaller than min_population are scored serially, since
+    inter-process traffic would cost more than it saves.
+    """
+    def __init__(self, tilemap, workers, min_population=2000):
+        super().__init__(tilemap)
+        self.workers = workers
+        self.min_population = min_population
+        self.executor = None
+
+    def evaluate(self, genes, start, a_star_path, ghost_positions, get_direction, pellets=None):
+        state = self.prepare(start, a_star_path, ghost_positions, get_direction, pellets)
+        if self.workers <= 1 or len(genes) < self.min_population:
+            return self.evaluate_genes(genes, start, *state)
+
+        if self.executor is None:
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_init_worker, initargs=([list(row) for row in self.tilemap],)
+            )
+        shards = np.array_split(genes, self.workers)
+        futures = [self.executor.submit(_evaluate_shard, shard, start, *state) for shard in shards]
+        return np.concatenate([future.result() for future in futures])
+
+    def close(self):
+        """Shut the worker processes down."""
+        if self.executor is not None:
+            self.executor.shutdown()
+            self.executor = None
+
+
+class FitnessCache:
+    """
+    Bounded LRU cache of chromosome fitness.
+
+    Entries are keyed on the world state a score depends on (start tile,
+    pellet-state version, ghost positions, A* path) and the chromosome. A
+    new pellet version invalidates everything: once a pellet is eaten, no
+    older state can come back. Duplicates within one generation are scored
+    once and count as hits.
+    """
+    def __init__(self, max_size=10000):
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.version = None  # Pellet-state version of the cached entries
+        self.hits = 0
+        self.misses = 0
+        self.hit_rates = []  # Hit rate of every generation
+
+    def __len__(self):
+        return len(self.entries)
+
+    def invalidate(self):
+        self.entries.clear()
+
+    def evaluate(self, population, state, score):
+        """
+        Fitness of every chromosome in the population under state
+        (start, version, ghost positions, path). score(chromosomes) computes
+        the fitness list of the chromosomes that are not cached.
+        """
+        if state[1] != self.version:
+            self.invalidate()
+            self.version = state[1]
+
+        scores = [None] * len(population)
+        missing = {}  # Key -> indices in the population
+        for index, chromosome in enumerate(population):
+            key = (state, chromosome.tobytes())
+            fitness = self.entries.get(key)
+            if fitness is None:
+                missing.setdefault(key, []).append(index)
+            else:
+                self.entries.move_to_end(key)
+                scores[index] = fitness
+
+        if missing:
+            fresh = score([population[indices[0]] for indices in missing.values()])
+            for (key, indices), fitness in zip(missing.items(), fresh):
+                self.entries[key] = fitness
+                for index in indices:
+                    scores[index] = fitness
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+        hits = len(population) - len(missing)
+        self.hits += hits
+        self.misses += len(missing)
+        self.hit_rates.append(hits / len(population) if len(population) else 0.0)
+        return scores
+
 
 class GeneticAlgorithm:
-    def __init__(self, population_size, chromosome_length, mutation_rate, tilemap, adversarial_algorithm=None):
+    def __init__(self, population_size, chromosome_length, mutation_rate, tilemap, adversarial_algorithm=None, verbose=True,
+                 workers=1, budget=None, receding_horizon=False, cache_size=0, vectorized=True, batch_threshold=64,
+                 selection='roulette', crossover_type='single_point', elitism=2, tournament_size=3, seed=None):
         """
         Initialize the Genetic Algorithm with parameters.
+        With workers > 1, large populations are evaluated in a process pool.
+        Populations whose size times the ghost count is below batch_threshold are
+        scored one chromosome at a time, which beats the array evaluator for them.
+        budget is the wall-clock time in seconds evolve_anytime() may spend per call.
+        With receding_horizon, commit_move() warm-starts the population after every executed move.
+        With cache_size > 0, up to that many fitness scores are memoized across generations.
+        vectorized breeds each generation with whole-population array operators:
+        selection is 'roulette' or 'tournament', crossover_type is 'single_point'
+        or 'uniform', and the elitism best chromosomes are carried over unchanged.
+        With a seed, every random choice comes from the GA's own generator;
+        without one, from the global random module (so random.seed() applies).
         """
         self.population_size = population_size
         self.chromosome_length = chromosome_length
         self.mutation_rate = mutation_rate
         self.tilemap = tilemap
+        self.random = random if seed is None else random.Random(seed)
         self.population = self.initialize_population()
+        self.graph = navigation_graph(tilemap)
         self.pathfinder = AStarAlgorithm(tilemap)
+        if workers > 1:
+            self.evaluator = ParallelFitnessEvaluator(tilemap, workers)
+        else:
+            self.evaluator = BatchFitnessEvaluator(tilemap)
+        self.batch_threshold = batch_threshold
+        self.fitness_cache = FitnessCache(cache_size) if cache_size else None
         self.adversarial_algorithm = adversarial_algorithm  # Optional: Pass in the AdversarialAlgorithm
         self.fitness_history = []  # Track max fitness of each generation
+        self.tilemap_scans = 0  # Full-map pellet scans done by get_target
+        self.verbose = verbose  # Print the fitness scores of every generation
+
+        # Anytime mode
+        self.budget = budget
+        self.champion = None  # (fitness, chromosome) of the best individual of the last generation
+        self.best = None  # (state, fitness, chromosome) best found since the world last changed
+        self.generations_per_frame = []  # Generations run by each evolve_anytime call
+        self.budget_overruns = 0  # evolve_anytime calls that took longer than the budget
+        self.receding_horizon = receding_horizon
+
+        # Population operators
+        self.vectorized = vectorized
+        self.selection = selection
+        self.crossover_type = crossover_type
+        self.elitism = elitism
+        self.tournament_size = tournament_size
+        self.rng = np.random.default_rng(self.random.getrandbits(64))  # Seeded from self.random, so seeds replay runs
+
+    def reset(self):
+        """
+        Start a fresh search, as a newly built GA would: new random population,
+        empty history and statistics. Random numbers are drawn in the same
+        order as __init__, so a reset replays exactly like a rebuild.
+        """
+        self.population = self.initialize_population()
+        self.fitness_history.clear()
+        self.tilemap_scans = 0
+        if self.fitness_cache is not None:
+            self.fitness_cache.invalidate()
+        self.champion = None
+        self.best = None
+        self.generations_per_frame.clear()
+        self.budget_overruns = 0
+        self.rng = np.random.default_rng(self.random.getrandbits(64))
 
     def initialize_population(self):
         """
-        Generate an initial population of random chromosomes (move sequences).
+        Generate an initial population of random chromosomes (move sequences),
+        one gene matrix row per chromosome.
         """
-        moves = ['UP', 'DOWN', 'LEFT', 'RIGHT']
-        return [[random.choice(moves) for _ in range(self.chromosome_length)]
-                for _ in range(self.population_size)]
+        return np.array([[self.random.randrange(len(MOVES)) for _ in range(self.chromosome_length)]
+                         for _ in range(self.population_size)], dtype=GENE_DTYPE).reshape(self.population_size, -1)
 
     def evaluate_fitness(self, game, chromosome, a_star_path, ghost_positions):
         if self.adversarial_algorithm:
@@ -32,6 +305,31 @@ class GeneticAlgorithm:
             # Fallback to the existing fitness evaluation logic if no AdversarialAlgorithm is provided
             return self.evaluate_fitness_without_adversarial(game, chromosome, a_star_path)
 
+    def evaluate_population(self, game, population, a_star_path, ghost_positions):
+        """
+        Evaluate every chromosome of the population at once.
+        Returns the same scores as calling evaluate_fitness on each chromosome.
+        Cached scores are reused when the game tracks a pellet-state version.
+        """
+        start = (game.player.tile_x, game.player.tile_y)
+        pellet_index = getattr(game, 'pellet_index', None)
+        pellets = pellet_index.mask() if pellet_index is not None else None  # Bitboard, no tilemap scan
+
+        def score(chromosomes):
+            if len(chromosomes) * max(len(ghost_positions), 1) < self.batch_threshold:
+                # Too small for the array set-up to pay off
+                return [self.evaluate_fitness(game, chromosome, a_star_path, ghost_positions)
+                        for chromosome in chromosomes]
+            genes = encode_population(chromosomes)
+            return self.evaluator.evaluate(genes, start, a_star_path, ghost_positions, self.get_direction,
+                                           pellets).tolist()
+
+        version = getattr(pellet_index, 'version', None)
+        if self.fitness_cache is None or version is None:
+            return score(population)
+        state = (start, version, tuple(ghost_positions), tuple(a_star_path))
+        return self.fitness_cache.evaluate(population, state, score)
+
     def evaluate_fitness_without_adversarial(self, game, chromosome, a_star_path):
         """
         Evaluate the fitness without the adversarial component (used if AdversarialAlgorithm is not passed).
@@ -39,10 +337,10 @@ class GeneticAlgorithm:
         score = 0
         position = (game.player.tile_x, game.player.tile_y)
         visited = set()
-        ghost_positions = [(enemy.tile_x, enemy.tile_y) for enemy in game.enemies]
+        ghost_positions = game.ghosts.positions()
 
         # Traverse each move in the chromosome
-        for move in chromosome:
+        for move in chromosome.tolist():
             new_position = self.simulate_move(position, move, game)
 
             # Penalize revisiting the same tile
@@ -72,10 +370,10 @@ class GeneticAlgorithm:
         position = initial_position
         path_index = 0
 
-        for move in chromosome:
+        for move in chromosome.tolist():
             if path_index < len(a_star_path):
                 next_position = a_star_path[path_index]
-                direction_to_next = self.get_direction(position, next_position)
+                direction_to_next = MOVE_INDEX.get(self.get_direction(position, next_position))
 
                 if move == direction_to_next:
                     score += 100
@@ -107,25 +405,9 @@ class GeneticAlgorithm:
 
     def simulate_move(self, position, move, game):
         """
-        Simulate a move and return the new position if valid, otherwise return the original position.
-        """
-        x, y = position
-        if move == 'UP':
-            y -= 1
-        elif move == 'DOWN':
-            y += 1
-        elif move == 'LEFT':
-            x -= 1
-        elif move == 'RIGHT':
-            x += 1
-        
-        if (
-            0 <= x < len(self.tilemap[0]) and
-            0 <= y < len(self.tilemap) and
-            self.tilemap[y][x] != 'W'
-        ):
-            return x, y
-        return position
+        Simulate a move (gene value) and return the new position if valid, otherwise return the original position.
+        """
+        return self.graph.move(position, move)
 
     def is_near_enemy(self, position, ghost_positions):
         """
@@ -139,38 +421,88 @@ class GeneticAlgorithm:
         start = (game.player.tile_x, game.player.tile_y)
         target = self.get_target(game)  # Get the next pellet or goal
         if target is None:
-            return random.choice(self.population)  # No target, return any chromosome
+            return self.random.choice(self.population)  # No target, return any chromosome
 
         a_star_path = self.pathfinder.find_path(start, target)
         
-        fitness_scores = [
-            self.evaluate_fitness(game, chromosome, a_star_path, [(enemy.tile_x, enemy.tile_y) for enemy in game.enemies])
-            for chromosome in self.population
-        ]
+        ghost_positions = game.ghosts.positions()
+        fitness_scores = self.evaluate_population(game, self.population, a_star_path, ghost_positions)
 
         # Track the best fitness score for the current generation
         self.fitness_history.append(max(fitness_scores))
-        print(f"Generation {len(self.fitness_history)} max fitness: {fitness_scores}")
-        selected = self.select_population(self.population, fitness_scores)
-        
-        new_population = []
-        while len(new_population) < self.population_size:
-            parent1, parent2 = random.sample(selected, 2)
-            child1, child2 = self.crossover(parent1, parent2)
-            new_population.append(self.mutate(child1))
-            if len(new_population) < self.population_size:
-                new_population.append(self.mutate(child2))
-        
-        self.population = new_population
+        self.champion = (self.fitness_history[-1], self.population[fitness_scores.index(self.fitness_history[-1])])
+        if self.verbose:
+            print(f"Generation {len(self.fitness_history)} max fitness: {fitness_scores}")
+            if self.fitness_cache is not None and self.fitness_cache.hit_rates:
+                print(f"Fitness cache hit rate: {self.fitness_cache.hit_rates[-1]:.0%}")
         best_chromosome = self.get_best_chromosome(fitness_scores)
-        
+        self.population = self.next_generation(self.population, fitness_scores)
+
         return best_chromosome
 
+    def evolve_anytime(self, game, a_star_path, budget=None):
+        """
+        Run as many generations as fit in the budget (seconds, self.budget by default)
+        and return the best chromosome found since the world last changed: since Pac-Man
+        arrived on his current tile, or, for games with a state_hash(), since a ghost
+        moved or a pellet was eaten. The population carries over, so the next call
+        resumes the search.
+        At least one generation always runs; calls that end past the budget count as overruns.
+        """
+        budget = self.budget if budget is None else budget
+        start = (game.player.tile_x, game.player.tile_y)
+        state = (start, game.state_hash() if hasattr(game, 'state_hash') else None)
+        if self.best is not None and self.best[0] != state:
+            self.best = None  # Plans scored against another tile, ghost or pellet layout no longer apply
+
+        began = time.perf_counter()
+        generations = 0
+        chromosome = None
+        while True:
+            self.champion = None
+            chromosome = self.evolve(game, a_star_path)
+            generations += 1
+            if self.champion is None:
+                break  # No target: nothing to search for
+            fitness, champion = self.champion
+            if self.best is None or fitness > self.best[1]:
+                self.best = (state, fitness, champion)
+            elapsed = time.perf_counter() - began
+            # Stop once the budget is spent or another generation of average length would overrun it
+            if elapsed + elapsed / generations > budget:
+                break
+
+        if time.perf_counter() - began > budget:
+            self.budget_overruns += 1
+        self.generations_per_frame.append(generations)
+        return chromosome if self.best is None else self.best[2]
+
+    def commit_move(self, move):
+        """
+        Receding horizon warm start after Pac-Man executed move: every chromosome
+        drops its first gene and gets a random one appended, so the search keeps
+        its plans for the following tiles. The last generation's champion is
+        carried over in the first slot if it had planned this move.
+        """
+        tail = [self.random.randrange(len(MOVES)) for _ in range(len(self.population))]
+        self.population = np.column_stack((self.population[:, 1:], np.array(tail, dtype=GENE_DTYPE)))
+        if self.champion is not None and self.champion[1][0] == move:
+            self.population[0, :-1] = self.champion[1][1:]
+            self.population[0, -1] = self.random.randrange(len(MOVES))
+        self.champion = None
+        self.best = None  # Pac-Man has left the tile the best plan started from
+
     def get_target(self, game):
         """
-        Determine the nearest pellet for Pacman using the heuristic function.
+        Determine the nearest pellet for Pacman by maze distance (AStar's heuristic).
         """
         start = (game.player.tile_x, game.player.tile_y)  # Current position of Pacman
+        pellet_index = getattr(game, 'pellet_index', None)
+        if pellet_index is not None:
+            return pellet_index.nearest(start)  # Incremental index, no map scan
+
+        # Games without a pellet index fall back to scanning the whole map
+        self.tilemap_scans += 1
         nearest_pellet = None
         min_distance = float('inf')
 
@@ -185,28 +517,96 @@ class GeneticAlgorithm:
         return nearest_pellet
 
 
+    def next_generation(self, population, fitness_scores):
+        """
+        Breed the population that replaces population, given its fitness scores.
+        """
+        if not self.vectorized:
+            # Per-individual operators
+            selected = self.select_population(population, fitness_scores)
+            new_population = []
+            while len(new_population) < self.population_size:
+                parent1, parent2 = self.random.sample(selected, 2)
+                child1, child2 = self.crossover(parent1, parent2)
+                new_population.append(self.mutate(child1))
+                if len(new_population) < self.population_size:
+                    new_population.append(self.mutate(child2))
+            return encode_population(new_population)
+
+        scores = np.asarray(fitness_scores, dtype=np.float64)
+        elites = population[np.argsort(-scores, kind='stable')[:min(self.elitism, self.population_size)]]
+        children = self.population_size - len(elites)
+        pairs = (children + 1) // 2
+        parents = self.select_parents(scores, 2 * pairs)
+        first, second = self.crossover_population(population[parents[:pairs]], population[parents[pairs:]])
+        offspring = self.mutate_population(np.concatenate((first, second))[:children])
+        return np.concatenate((elites, offspring))
+
+    def select_parents(self, scores, count):
+        """
+        Indices of count parents drawn by roulette (chance proportional to
+        positive fitness, uniform if none is positive) or by tournament.
+        """
+        size = len(scores)
+        if self.selection == 'tournament':
+            contestants = self.rng.integers(0, size, size=(count, self.tournament_size))
+            return contestants[np.arange(count), np.argmax(scores[contestants], axis=1)]
+
+        weights = np.cumsum(np.maximum(scores, 0))
+        if weights[-1] == 0:
+            return self.rng.integers(0, size, size=count)
+        picks = np.searchsorted(weights, self.rng.random(count) * weights[-1], side='right')
+        return np.minimum(picks, size - 1)
+
+    def crossover_population(self, parents1, parents2):
+        """
+        Cross every row of parents1 with the same row of parents2 in one step:
+        single-point (a random split per pair) or uniform (a coin flip per gene).
+        """
+        count, length = parents1.shape
+        if length < 2:
+            return parents1.copy(), parents2.copy()
+        if self.crossover_type == 'uniform':
+            from_first = self.rng.random((count, length)) < 0.5
+        else:
+            splits = self.rng.integers(1, length, size=count)
+            from_first = np.arange(length) < splits[:, None]
+        return np.where(from_first, parents1, parents2), np.where(from_first, parents2, parents1)
+
+    def mutate_population(self, genes):
+        """
+        Mutate a gene matrix with a single RNG call: a draw below mutation_rate
+        selects the gene, and the same draw rescaled picks its new move.
+        """
+        if self.mutation_rate <= 0:
+            return genes
+        draws = self.rng.random(genes.shape)
+        mutated = draws < self.mutation_rate
+        new_genes = (draws / self.mutation_rate * len(MOVES)).astype(GENE_DTYPE)
+        return np.where(mutated, new_genes, genes)
+
     def select_population(self, population, fitness_scores):
         """
         Select a subset of the population based on their fitness scores using roulette selection.
         """
+        indices = range(len(population))
         total_fitness = sum(max(score, 0) for score in fitness_scores)
         if total_fitness == 0:
-            return random.sample(population, len(population) // 2)
+            return [population[i] for i in self.random.sample(indices, len(population) // 2)]
         probabilities = [max(score, 0) / total_fitness for score in fitness_scores]
-        return random.choices(population, weights=probabilities, k=len(population) // 2)
+        return [population[i] for i in self.random.choices(indices, weights=probabilities, k=len(population) // 2)]
 
     def crossover(self, parent1, parent2):
         """
         Perform single-point crossover between two parents.
         """
-        split = random.randint(1, self.chromosome_length - 1)
-        return parent1[:split] + parent2[split:], parent2[:split] + parent1[split:]
+        split = self.random.randint(1, self.chromosome_length - 1)
+        return np.concatenate((parent1[:split], parent2[split:])), np.concatenate((parent2[:split], parent1[split:]))
 
     def mutate(self, chromosome):
-        moves = ['UP', 'DOWN', 'LEFT', 'RIGHT']
         for i in range(len(chromosome)):
-            if random.random() < self.mutation_rate:
-                chromosome[i] = random.choice(moves)
+            if self.random.random() < self.mutation_rate:
+                chromosome[i] = self.random.randrange(len(MOVES))
         return chromosome
 
     def get_best_chromosome(self, fitness_scores):
@@ -220,10 +620,16 @@ class GeneticAlgorithm:
 class AStarAlgorithm:
     def __init__(self, tilemap):
         self.tilemap = tilemap
-        self.directions = [(0, 1), (1, 0), (0, -1), (-1, 0)]
+        self.graph = navigation_graph(tilemap)
 
     def heuristic(self, a, b):
-        distance = abs(a[0] - b[0]) + abs(a[1] - b[1])
+        """
+        Exact maze distance from the navigation graph, a perfect A* heuristic.
+        Falls back to Manhattan distance for positions off the walkable graph.
+        """
+        distance = self.graph.distance(a, b)
+        if distance is None:
+            distance = abs(a[0] - b[0]) + abs(a[1] - b[1])
         # print(f"Heuristic from {a} to {b}: {distance}")  # Debugging Heuristic Calculation
         return distance
 
@@ -231,34 +637,31 @@ class AStarAlgorithm:
         """
         Check if a given position is valid (not a wall or out of bounds).
         """
-        x, y = position
-        if 0 <= x < len(self.tilemap[0]) and 0 <= y < len(self.tilemap) and self.tilemap[y][x] != 'W':
-            return True
-        return False
+        return self.graph.is_walkable(position)
 
     def find_path(self, start, goal, blocked_positions=None):
         if blocked_positions is None:
             blocked_positions = []
         open_set = []
-        heapq.heappush(open_set, (0, start))
+        heapq.heappush(open_set, (0, 0, start))
         came_from = {}
         g_score = {start: 0}
         f_score = {start: self.heuristic(start, goal)}
 
         while open_set:
-            _, current = heapq.heappop(open_set)
+            _, _, current = heapq.heappop(open_set)
             if current == goal:
                 return self.reconstruct_path(came_from, current)
-            for dx, dy in self.directions:
-                neighbor = (current[0] + dx, current[1] + dy)
-                if not self.is_walkable(neighbor) or neighbor in blocked_positions:
+            for neighbor in self.graph.adjacent[self.graph.tile_id(current)]:
+                if neighbor in blocked_positions:
                     continue
                 tentative_g_score = g_score[current] + 1
                 if neighbor not in g_score or tentative_g_score < g_score[neighbor]:
                     came_from[neighbor] = current
                     g_score[neighbor] = tentative_g_score
                     f_score[neighbor] = tentative_g_score + self.heuristic(neighbor, goal)
-                    heapq.heappush(open_set, (f_score[neighbor], neighbor))
+                    # Ties go to the deepest node, so an exact heuristic walks straight down the path
+                    heapq.heappush(open_set, (f_score[neighbor], -tentative_g_score, neighbor))
 
 
             # # Debugging each iteration
@@ -303,7 +706,7 @@ class AdversarialAlgorithm:
         position = (game.player.tile_x, game.player.tile_y)
         visited = set()
 
-        for move in chromosome:
+        for move in chromosome.tolist():
             new_position = self.genetic_algorithm.simulate_move(position, move, game)
 
             # Penalize revisiting the same tile
@@ -342,27 +745,21 @@ class AdversarialAlgorithm:
         target = self.genetic_algorithm.get_target(game)  # Next pellet/goal
 
         if target is None:
-            return random.choice(self.genetic_algorithm.population)  # No target, return any chromosome
+            return self.genetic_algorithm.random.choice(self.genetic_algorithm.population)  # No target, return any chromosome
 
         # Avoidance path considering ghost positions
-        ghost_positions = [(enemy.tile_x, enemy.tile_y) for enemy in game.enemies]
+        ghost_positions = game.ghosts.positions()
         a_star_path = self.calculate_avoidance_path(start, target, ghost_positions)
 
         # Evaluate fitness and evolve population
-        fitness_scores = [self.evaluate_fitness(game, chromosome, a_star_path, ghost_positions) for chromosome in self.genetic_algorithm.population]
-        selected = self.genetic_algorithm.select_population(self.genetic_algorithm.population, fitness_scores)
-
-        new_population = []
-        while len(new_population) < self.genetic_algorithm.population_size:
-            parent1, parent2 = random.sample(selected, 2)
-            child1, child2 = self.genetic_algorithm.crossover(parent1, parent2)
-            new_population.append(self.genetic_algorithm.mutate(child1))
-            if len(new_population) < self.genetic_algorithm.population_size:
-                new_population.append(self.genetic_algorithm.mutate(child2))
-
-        self.genetic_algorithm.population = new_population
+        fitness_scores = self.genetic_algorithm.evaluate_population(
+            game, self.genetic_algorithm.population, a_star_path, ghost_positions
+        )
         best_chromosome = self.genetic_algorithm.get_best_chromosome(fitness_scores)
-        
+        self.genetic_algorithm.population = self.genetic_algorithm.next_generation(
+            self.genetic_algorithm.population, fitness_scores
+        )
+
         return best_chromosome
 
 
@@ -0,0 +1,353 @@
+# navigation.py
+import math
+from collections import deque
+import numpy as np
+
+# Move order used by the genetic algorithm's chromosomes
+MOVES = ['UP', 'DOWN', 'LEFT', 'RIGHT']
+MOVE_INDEX = {move: index for index, move in enumerate(MOVES)}
+MOVE_DELTAS = [(0, -1), (0, 1), (-1, 0), (1, 0)]  # (dx, dy) for each entry of MOVES
+
+# Expansion order used by the A* and ghost searches
+SEARCH_DIRECTIONS = [(0, 1), (1, 0), (0, -1), (-1, 0)]
+
+UNREACHABLE = np.iinfo(np.uint16).max  # Distance table entry for disconnected tiles
+
+
+class NavigationGraph:
+    """
+    Compiled topology of a tilemap: the single source of truth for walls,
+    neighbours and teleporters.
+
+    Tiles are identified by integer ids (y * width + x). Every lookup a
+    pathfinder or move simulator needs is a table access:
+    - neighbors[id]: walkable neighbour ids in SEARCH_DIRECTIONS order
+    - transitions[id][move]: tile reached by each of MOVES (blocked moves stay put)
+    - teleports[id]: the paired teleporter of a 'T' tile
+    - distances[dense[a], dense[b]]: exact maze distance between walkable tiles
+
+    Teleporting is an instant effect applied by the player when it lands on a
+    'T' tile, so the neighbour and transition tables only contain single steps.
+    """
+    def __init__(self, tilemap):
+        self.width = len(tilemap[0])
+        self.height = len(tilemap)
+        self.size = self.width * self.height
+        self.positions = [(tile_id % self.width, tile_id // self.width) for tile_id in range(self.size)]
+        self.walkable = [tilemap[y][x] != 'W' for x, y in self.positions]
+
+        self.neighbors = []
+        self.adjacent = []  # Same as neighbors, as (x, y) positions
+        self.transitions = []
+        for tile_id, (x, y) in enumerate(self.positions):
+            neighbors = [self.step(x, y, dx, dy) for dx, dy in SEARCH_DIRECTIONS]
+            self.neighbors.append(tuple(n for n in neighbors if n is not None))
+            self.adjacent.append(tuple(self.positions[n] for n in self.neighbors[-1]))
+            moves = [self.step(x, y, dx, dy) for dx, dy in MOVE_DELTAS]
+            self.transitions.append(tuple(tile_id if n is None else n for n in moves))
+        self.transition_array = np.array(self.transitions, dtype=np.intp)
+
+        # Teleporters are paired in the order they appear on the map
+        teleporters = [tile_id for tile_id, (x, y) in enumerate(self.positions) if tilemap[y][x] == 'T']
+        self.teleports = {}
+        for a, b in zip(teleporters[::2], teleporters[1::2]):
+            self.teleports[a] = b
+            self.teleports[b] = a
+
+        # All-pairs shortest paths over the walkable tiles, indexed densely
+        self.walkable_ids = [tile_id for tile_id in range(self.size) if self.walkable[tile_id]]
+        self.dense = [-1] * self.size
+        for index, tile_id in enumerate(self.walkable_ids):
+            self.dense[tile_id] = index
+        self.distances = self.build_distance_table()
+        self.zobrist = ZobristKeys(self.size)
+
+    def build_distance_table(self):
+        """
+        Breadth-first search from every walkable tile; one uint16 row per source.
+        """
+        count = len(self.walkable_ids)
+        distances = np.empty((count, count), dtype=np.uint16)
+        for source, source_id in enumerate(self.walkable_ids):
+            row = [UNREACHABLE] * count
+            row[source] = 0
+            queue = deque([source_id])
+            while queue:
+                current = queue.popleft()
+                step = row[self.dense[current]] + 1
+                for neighbor in self.neighbors[current]:
+                    index = self.dense[neighbor]
+                    if row[index] == UNREACHABLE:
+                        row[index] = step
+                        queue.append(neighbor)
+            distances[source] = row
+        return distances
+
+    def step(self, x, y, dx, dy):
+        """Return the id of the walkable tile at (x + dx, y + dy), or None."""
+        nx, ny = x + dx, y + dy
+        if 0 <= nx < self.width and 0 <= ny < self.height:
+            tile_id = ny * self.width + nx
+            if self.walkable[tile_id]:
+                return tile_id
+        return None
+
+    def tile_id(self, position):
+        return position[1] * self.width + position[0]
+
+    def in_bounds(self, position):
+        return 0 <= position[0] < self.width and 0 <= position[1] < self.height
+
+    def is_walkable(self, position):
+        """Check if a given position is valid (not a wall or out of bounds)."""
+        return self.in_bounds(position) and self.walkable[self.tile_id(position)]
+
+    def move(self, position, move_index):
+        """Position reached by one of MOVES, or the same position if blocked."""
+        return self.positions[self.transitions[self.tile_id(position)][move_index]]
+
+    def distance(self, a, b):
+        """
+        Shortest walking distance between two positions, as a table lookup.
+        Returns None if either position is not walkable, math.inf if they are disconnected.
+        """
+        if not (self.in_bounds(a) and self.in_bounds(b)):
+            return None
+        source, target = self.dense[self.tile_id(a)], self.dense[self.tile_id(b)]
+        if source < 0 or target < 0:
+            return None
+        distance = int(self.distances[source, target])
+        return math.inf if distance == UNREACHABLE else distance
+
+    def teleport_destination(self, position):
+        """Paired teleporter position if the position is a teleporter, otherwise None."""
+        destination = self.teleports.get(self.tile_id(position))
+        return None if destination is None else self.positions[destination]
+
+
+class ZobristKeys:
+    """
+    Random 64-bit keys for Zobrist hashing of game states: one per tile for a
+    pellet, for the player and for every ghost slot. A state's hash is the XOR
+    of the keys of everything in it, so each change costs one or two XORs.
+    Keys come from a fixed seed and never touch the game's random state.
+    """
+    def __init__(self, size, seed=0):
+        self.size = size
+        self.rng = np.random.default_rng(seed)
+        self.pellet = self.draw(size)
+        self.player = self.draw(size)
+        self.ghost = self.draw(0, size)  # One row per ghost slot, grown on demand
+
+    def draw(self, *shape):
+        return self.rng.integers(0, 2 ** 64, size=shape, dtype=np.uint64)
+
+    def ghost_keys(self, slots):
+        """Key rows for at least slots ghosts."""
+        if len(self.ghost) < slots:
+            self.ghost = np.concatenate((self.ghost, self.draw(slots - len(self.ghost), self.size)))
+        return self.ghost
+
+
+_graphs = {}
+
+
+def navigation_graph(tilemap):
+    """
+    Return the navigation graph for the tilemap's layout, building it only once per map.
+    Pellets come and go, so the graph is keyed on walls and teleporters alone.
+    """
+    layout = tuple(''.join(tile if tile in 'WT' else ' ' for tile in row) for row in tilemap)
+    graph = _graphs.get(layout)
+    if graph is None:
+        graph = _graphs[layout] = NavigationGraph(tilemap)
+    return graph
+
+
+class PelletIndex:
+    """
+    Remaining pellets of a level plus a multi-source BFS distance field.
+
+    The pellets are a bitboard: bit tile_id of an int is set while that tile
+    holds a pellet, so membership is a shift and the whole layout is one
+    immutable value. A Zobrist hash of the layout is kept alongside it.
+
+    Every walkable tile stores the distance to, and the id of, its nearest
+    pellet, so nearest() is a lookup. The field is rebuilt lazily, only after
+    a pellet has been removed. Ties go to the first pellet in row-major order,
+    matching a scan of the tilemap.
+    """
+    def __init__(self, graph, tilemap):
+        self.graph = graph
+        self.keys = graph.zobrist.pellet.tolist()
+        self.rebuilds = 0  # Distance field recomputations
+        self.version = 0  # Bumped whenever the set of remaining pellets changes
+        self.nearest_pellet = None
+        self.reset(tilemap)
+
+    def reset(self, tilemap):
+        """Index the pellets of a freshly reset tilemap."""
+        self.bits = 0
+        self.count = 0
+        self.hash = 0  # Zobrist hash of the remaining pellets
+        for tile_id, (x, y) in enumerate(self.graph.positions):
+            if tilemap[y][x] == '.':
+                self.bits |= 1 << tile_id
+                self.count += 1
+                self.hash ^= self.keys[tile_id]
+        self.dirty = True
+        self.version += 1
+
+    def state(self):
+        """The pellets and their distance field, for restore()."""
+        if self.dirty or self.nearest_pellet is None:
+            self.rebuild()
+        return self.bits, self.count, self.hash, self.nearest_distance, self.nearest_pellet
+
+    def restore(self, state):
+        """
+        Return to a state() taken earlier. The field lists are shared, not
+        copied: rebuild() always replaces them rather than editing them.
+        """
+        self.bits, self.count, self.hash, self.nearest_distance, self.nearest_pellet = state
+        self.dirty = False
+        self.version += 1
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, position):
+        return self.graph.in_bounds(position) and self.has_pellet(self.graph.tile_id(position))
+
+    def has_pellet(self, tile_id):
+        return self.bits >> tile_id & 1 == 1
+
+    def remove(self, position):
+        """Forget an eaten pellet; the distance field is refreshed on the next query."""
+        tile_id = self.graph.tile_id(position)
+        if self.has_pellet(tile_id):
+            self.bits ^= 1 << tile_id
+            self.count -= 1
+            self.hash ^= self.keys[tile_id]
+            self.dirty = True
+            self.version += 1
+
+    def mask(self):
+        """Boolean array over tile ids, True where a pellet remains."""
+        data = np.frombuffer(self.bits.to_bytes((self.graph.size + 7) // 8, 'little'), dtype=np.uint8)
+        return np.unpackbits(data, bitorder='little')[:self.graph.size].view(bool)
+
+    def rebuild(self):
+        self.rebuilds += 1
+        self.dirty = False
+        # Built in locals and swapped in at the end, so a background planner
+        # reading the index never sees a half-built field
+        nearest_distance = [math.inf] * self.graph.size
+        nearest_pellet = [-1] * self.graph.size
+        bits = self.bits
+        sources = [tile_id for tile_id in range(self.graph.size) if bits >> tile_id & 1]
+        for tile_id in sources:
+            nearest_distance[tile_id] = 0
+            nearest_pellet[tile_id] = tile_id
+
+        queue = deque(sources)
+        while queue:
+            current = queue.popleft()
+            step = nearest_distance[current] + 1
+            label = nearest_pellet[current]
+            for neighbor in self.graph.neighbors[current]:
+                if nearest_distance[neighbor] == math.inf:
+                    nearest_distance[neighbor] = step
+                    nearest_pellet[neighbor] = label
+                    queue.append(neighbor)
+                elif nearest_distance[neighbor] == step and label < nearest_pellet[neighbor]:
+                    # Equidistant pellets: keep the first in row-major order
+                    nearest_pellet[neighbor] = label
+        self.nearest_distance, self.nearest_pellet = nearest_distance, nearest_pellet
+
+    def nearest(self, position):
+        """Position of the pellet closest to position by maze distance, or None."""
+        if self.dirty or self.nearest_pellet is None:
+            self.rebuild()
+        if not self.graph.in_bounds(position):
+            return None
+        pellet = self.nearest_pellet[self.graph.tile_id(position)]
+        return None if pellet < 0 else self.graph.positions[pellet]
+
+
+class GhostNavigator:
+    """
+    Shared pathfinding service for the ghosts.
+
+    For each goal tile it keeps one reverse BFS field: the distance to the
+    goal and the next tile towards it (a parent pointer) for every tile.
+    Ghosts chasing the same tile share a field, and paths are read off the
+    parent pointers instead of being copied during the search. The maze
+    never changes, so a field stays valid until the goal moves elsewhere;
+    at most one field per walkable tile is ever built.
+    """
+    def __init__(self, graph):
+        self.graph = graph
+        self.fields = {}  # Goal tile id -> (distance, parent) lists
+        self.builds = 0  # Fields computed so far
+        self.next_hop = None  # Parent pointers of every field, for batched lookups
+
+    def field(self, goal):
+        """Distance and parent lists rooted at goal, or None if goal is not walkable."""
+        if not self.graph.is_walkable(goal):
+            return None
+        root = self.graph.tile_id(goal)
+        field = self.fields.get(root)
+        if field is None:
+            field = self.fields[root] = self.build_field(root)
+        return field
+
+    def build_field(self, root):
+        self.builds += 1
+        distance = [math.inf] * self.graph.size
+        parent = [-1] * self.graph.size
+        distance[root] = 0
+        queue = deque([root])
+        while queue:
+            current = queue.popleft()
+            for neighbor in self.graph.neighbors[current]:
+                if distance[neighbor] == math.inf:
+                    distance[neighbor] = distance[current] + 1
+                    parent[neighbor] = current  # One step closer to the root
+                    queue.append(neighbor)
+        return distance, parent
+
+    def next_hop_table(self):
+        """
+        Matrix of parent pointers indexed [goal id, tile id]: the next tile from
+        tile towards goal, or -1 at the goal itself, on walls and when unreachable.
+        Built on first use from a field for every walkable goal.
+        """
+        if self.next_hop is None:
+            self.next_hop = np.full((self.graph.size, self.graph.size), -1, dtype=np.int16)
+            for goal in self.graph.walkable_ids:
+                self.next_hop[goal] = self.field(self.graph.positions[goal])[1]
+        return self.next_hop
+
+    def next_step(self, start, goal):
+        """The tile after start on a shortest path to goal, or None."""
+        field = self.field(goal)
+        if field is None or start == goal or not self.graph.is_walkable(start):
+            return None
+        parent = field[1][self.graph.tile_id(start)]
+        return None if parent < 0 else self.graph.positions[parent]
+
+    def path(self, start, goal):
+        """Shortest path from start to goal (excluding start) by following parent pointers."""
+        field = self.field(goal)
+        if field is None or not self.graph.is_walkable(start):
+            return []
+        distance, parent = field
+        current = self.graph.tile_id(start)
+        if distance[current] == math.inf:
+            return []
+        path = []
+        while distance[current] > 0:
+            current = parent[current]
+            path.append(self.graph.positions[current])
+        return path
@@ -2,22 +2,55 @@ import pygame
 from config import *
 from config import TilemapManager
 from model import AStarAlgorithm
-from model import GeneticAlgorithm
-from collections import deque
+from navigation import MOVE_DELTAS, MOVE_INDEX, navigation_graph
 import math
 
+
+_images = {}  # (path, converted) -> image scaled to TILESIZE, shared by every sprite in the process
+
+
+def load_image(game, path):
+    """
+    Load a sprite image scaled to TILESIZE. Each image is read from disk and
+    scaled once per process; later calls, from any sprite, game or level,
+    share that surface.
+    Headless games have no display to convert against, so they get no image.
+    Without a display mode set, images are cached unconverted.
+    """
+    if game.headless:
+        return None
+    converted = pygame.display.get_surface() is not None
+    image = _images.get((path, converted))
+    if image is None:
+        image = pygame.image.load(path)
+        if converted:
+            image = image.convert_alpha()  # Match the display format for fast blits
+        image = _images[(path, converted)] = pygame.transform.scale(image, (TILESIZE, TILESIZE))
+    return image
+
+
 class Player(pygame.sprite.Sprite):
-    def __init__(self, game, x, y, population_size=10, chromosome_length=10, mutation_rate=0.1):
+    def __init__(self, game, x, y):
         self.game = game
         self._layer = PLAYER_LAYER
         self.groups = self.game.all_sprites
         pygame.sprite.Sprite.__init__(self, self.groups)
 
-        self.image = pygame.image.load('assets/packman.png').convert_alpha()
-        self.image = pygame.transform.scale(self.image, (TILESIZE, TILESIZE))
-        self.rect = self.image.get_rect(topleft=(x * TILESIZE, y * TILESIZE))
+        self.image = load_image(game, 'assets/packman.png')
+        self.rect = pygame.Rect(x * TILESIZE, y * TILESIZE, TILESIZE, TILESIZE)
+        self.speed = PLAYER_SPEED
+        self.tilemap = TilemapManager.tilemap
+        self.visited_tiles = set()  # Set to track visited tiles
+        self.reset(x, y)
+
+        self.graph = navigation_graph(TilemapManager.tilemap)
+        self.pathfinder = AStarAlgorithm(TilemapManager.tilemap)
+
+        # The game's Genetic Algorithm makes the decisions, here or in its background planner
+        self.ga = game.ga
 
-        # Initialize attributes
+    def reset(self, x, y):
+        """Put the player back on tile (x, y) with a fresh level's state."""
         self.direction = (0, 0)  # Initialize direction (dx, dy)
         self.tile_x = x
         self.tile_y = y
@@ -26,18 +59,10 @@ class Player(pygame.sprite.Sprite):
         self.target_x = self.tile_x * TILESIZE
         self.target_y = self.tile_y * TILESIZE
         self.collected_pellets = 0  # Track collected pellets
-        self.speed = PLAYER_SPEED
-        self.tilemap = TilemapManager.tilemap
         self.score = 0  # Attribute for SCORES
-
         self.path = []
-        self.pathfinder = AStarAlgorithm(TilemapManager.tilemap)
-
-        # Initialize the Genetic Algorithm for decision-making
-        self.ga = GeneticAlgorithm(population_size, chromosome_length, mutation_rate, TilemapManager.tilemap)
-        
-        # Visited tiles tracker
-        self.visited_tiles = set()  # Set to track visited tiles
+        self.visited_tiles.clear()
+        self.committed_move = None  # Index into MOVE_DELTAS of the move started this tick, if any
 
     def move(self, dx=0, dy=0, use_ga=False, game=None):
         """
@@ -56,19 +81,28 @@ class Player(pygame.sprite.Sprite):
                 if not a_star_path:
                     return  # No path found, exit early
 
-                # Use GA to evolve and determine the next move
-                best_chromosome = self.ga.evolve(game, a_star_path)
-                if best_chromosome:
-                    move_direction = best_chromosome[0]
+                if not game.planning_in_background():
+                    # Use GA to evolve and determine the next move
+                    if self.ga.budget is None:
+                        best_chromosome = self.ga.evolve(game, a_star_path)
+                    else:
+                        best_chromosome = self.ga.evolve_anytime(game, a_star_path, game.ga_time_left())
+                else:
+                    # Never wait on the background planner: use its latest plan if it starts here
+                    plan = game.planner.latest()
+                    on_tile = plan is not None and plan.start == (self.tile_x, self.tile_y)
+                    best_chromosome = plan.chromosome if on_tile else None
+                if best_chromosome is not None:
+                    move_direction = int(best_chromosome[0])  # First gene: the move to make now
                     dx, dy = self.get_move_direction(move_direction)
                     new_position = (self.tile_x + dx, self.tile_y + dy)
 
                     # Check for ghost proximity before executing the move
-                    ghost_positions = [(enemy.tile_x, enemy.tile_y) for enemy in game.enemies]
-                    if not self.is_near_enemy(new_position, ghost_positions):
+                    if not self.is_near_enemy(new_position):
                         # Validate the GA-suggested move
                         if self.pathfinder.is_walkable(new_position):
                             self._execute_move(dx, dy)
+                            self.commit_move(move_direction)
                             return  # Move executed successfully
                     # Else, continue without any debug output
 
@@ -76,6 +110,7 @@ class Player(pygame.sprite.Sprite):
                 next_position = a_star_path[0]
                 dx, dy = next_position[0] - self.tile_x, next_position[1] - self.tile_y
                 self._execute_move(dx, dy)
+                self.commit_move(MOVE_INDEX.get(self.ga.get_direction((0, 0), (dx, dy))))
             else:
                 # No valid target found for GA or A*
                 return
@@ -84,12 +119,23 @@ class Player(pygame.sprite.Sprite):
             self._execute_move(dx, dy)
 
 
-    def is_near_enemy(self, position, ghost_positions):
+    def commit_move(self, move):
         """
-        Check if the given position is near any enemy based on precomputed positions.
+        Let a receding-horizon GA shift its population past the move just made.
+        A running background planner owns the population, so it is left alone.
         """
-        return any(abs(position[0] - ghost_x) + abs(position[1] - ghost_y) <= 1
-                for ghost_x, ghost_y in ghost_positions)
+        if (self.committed_move is not None and self.ga.receding_horizon  # Teleports end the move at once
+                and not self.game.planning_in_background()):
+            self.ga.commit_move(move)
+
+    def is_near_enemy(self, position):
+        """
+        Check if a ghost stands on the given position or a tile next to it, the
+        rule the GA's fitness uses. Five lookups, however many ghosts there are.
+        """
+        ghost_at = self.game.registry.ghost_at
+        x, y = position
+        return any(ghost_at(tile) for tile in ((x, y), (x, y - 1), (x, y + 1), (x - 1, y), (x + 1, y)))
 
 
 
@@ -101,17 +147,15 @@ class Player(pygame.sprite.Sprite):
             new_tile_x = self.tile_x + dx
             new_tile_y = self.tile_y + dy
 
-            # Create a rect for the next position
-            new_rect = pygame.Rect(new_tile_x * TILESIZE, new_tile_y * TILESIZE, TILESIZE, TILESIZE)
-
-            # Check for collisions with blocks (walls)
-            if any(new_rect.colliderect(block.rect) for block in self.game.blocks):
+            # Check for collisions with blocks (walls); everything is tile aligned
+            if self.game.registry.wall_at((new_tile_x, new_tile_y)):
                 print(f"Move blocked by wall at ({new_tile_x}, {new_tile_y})")
                 return  # Stop the move if there is a collision
 
             # Proceed with movement
             self.moving = True
             self.direction = (dx, dy)  # Update direction
+            self.committed_move = MOVE_DELTAS.index((dx, dy)) if (dx, dy) in MOVE_DELTAS else None
             self.target_x = new_tile_x * TILESIZE
             self.target_y = new_tile_y * TILESIZE
 
@@ -122,44 +166,39 @@ class Player(pygame.sprite.Sprite):
             # Mark the tile as visited
             self.visited_tiles.add((self.tile_x, self.tile_y))
 
-            tilemap = TilemapManager.tilemap
-
             # Handle teleporters
-            if tilemap[self.tile_y][self.tile_x] == 'T':
+            if self.graph.teleport_destination((self.tile_x, self.tile_y)):
                 self.teleport()
 
             # Eat pellet if present
-            if tilemap[self.tile_y][self.tile_x] == '.':
+            if self.game.registry.pellet_at((self.tile_x, self.tile_y)):
                 self.eat_pellet()
 
     def get_move_direction(self, move):
         """
-        Convert a move ('UP', 'DOWN', 'LEFT', 'RIGHT') into dx, dy direction.
+        Convert a move gene (index into MOVES: UP, DOWN, LEFT, RIGHT) into dx, dy direction.
         """
-        if move == 'UP':
-            return 0, -1
-        elif move == 'DOWN':
-            return 0, 1
-        elif move == 'LEFT':
-            return -1, 0
-        elif move == 'RIGHT':
-            return 1, 0
+        if 0 <= move < len(MOVE_DELTAS):
+            return MOVE_DELTAS[move]
         return 0, 0
 
     def eat_pellet(self):
         tilemap = TilemapManager.tilemap
         if tilemap[self.tile_y][self.tile_x] == '.':
             tilemap[self.tile_y][self.tile_x] = ' '  # Replace pellet with empty space
+            self.game.pellet_index.remove((self.tile_x, self.tile_y))  # New pellet version
+            # Scores that counted this pellet are stale; under the planner the cache sees the new version itself
+            if self.ga.fitness_cache is not None and not self.game.planning_in_background():
+                self.ga.fitness_cache.invalidate()
             self.collected_pellets += 1
             self.score += 10  # Increment score
             TilemapManager.tilemap = tilemap
 
     def teleport(self):
-        # Teleport logic: Move to the corresponding teleporter
-        if (self.tile_x, self.tile_y) == (19, 9):  # Right teleporter
-            self.tile_x, self.tile_y = 1, 9  # Move to left teleporter
-        elif (self.tile_x, self.tile_y) == (1, 9):  # Left teleporter
-            self.tile_x, self.tile_y = 19, 9  # Move to right teleporter
+        # Teleport logic: Move to the paired teleporter from the navigation graph
+        destination = self.graph.teleport_destination((self.tile_x, self.tile_y))
+        if destination:
+            self.tile_x, self.tile_y = destination
 
         # Update the rect position immediately to the new tile position
         self.rect.topleft = (self.tile_x * TILESIZE, self.tile_y * TILESIZE)
@@ -169,6 +208,7 @@ class Player(pygame.sprite.Sprite):
         """
         Update the player's state. Handles movement logic.
         """
+        self.committed_move = None
         if not self.moving:
             # Use the unified `move` method with GA and A*
             self.move(use_ga=True, game=game)
@@ -189,453 +229,11 @@ class Player(pygame.sprite.Sprite):
                     self.rect.x, self.rect.y = self.target_x, self.target_y
                     self.moving = False
 
-class Blinky(pygame.sprite.Sprite):
-    def __init__(self, game, x, y):
-        self.game = game
-        self._layer = ENEMY_LAYER
-        self.groups = self.game.all_sprites, self.game.enemies
-        pygame.sprite.Sprite.__init__(self, self.groups)
-
-        self.image = pygame.image.load('assets/blinky.png').convert_alpha()
-        self.image = pygame.transform.scale(self.image, (TILESIZE, TILESIZE))  # Scale enemy to TILESIZE
-        self.rect = self.image.get_rect()
-
-        # Tile coordinates
-        self.tile_x = x  # Tile coordinate X
-        self.tile_y = y  # Tile coordinate Y
-
-        # Set initial pixel position based on tile coordinates
-        self.x = self.tile_x * TILESIZE
-        self.y = self.tile_y * TILESIZE
-        self.rect.topleft = (self.x, self.y)
-
-        # Movement attributes
-        self.is_moving = False
-        self.speed = GHOST_SPEED
-        self.last_move_time = pygame.time.get_ticks()
-
-        self.target_tile = None  # Target tile for movement
-        self.path = []  # Path to follow
-
-    def calculate_goal(self):
-        """Directly target the player's current tile."""
-        player = self.game.player
-        return player.tile_x, player.tile_y
-
-    def move(self):
-        """Move towards the target tile or follow the path."""
-        current_time = pygame.time.get_ticks()
-
-        # If actively moving towards a target tile
-        if self.target_tile and self.is_moving:
-            target_x, target_y = self.target_tile[0] * TILESIZE, self.target_tile[1] * TILESIZE
-            dx, dy = target_x - self.x, target_y - self.y
-            distance = (dx ** 2 + dy ** 2) ** 0.5
-
-            if distance > 0:
-                # Normalize the direction vector and move at the set speed
-                step_x = (dx / distance) * self.speed
-                step_y = (dy / distance) * self.speed
-                self.x += step_x
-                self.y += step_y
-                self.rect.topleft = (round(self.x), round(self.y))
-
-            # Snap to the target tile if close enough
-            if abs(dx) < self.speed and abs(dy) < self.speed:
-                self.x, self.y = target_x, target_y
-                self.rect.topleft = (self.x, self.y)
-                self.tile_x, self.tile_y = self.target_tile  # Update to the new tile position
-                self.is_moving = False
-
-        # If stationary, calculate a new path
-        elif current_time - self.last_move_time > self.speed:
-            if not self.is_moving and not self.path:
-                start = (self.tile_x, self.tile_y)
-                goal = self.calculate_goal()
-                self.path = self.bfs(start, goal, tilemap)
-                self.last_move_time = current_time
-
-            if self.path:
-                next_tile = self.path.pop(0)
-                self.start_moving(next_tile)
-
-    def get_position(self):
-        """Return the current tile position."""
-        return self.tile_x, self.tile_y
-
-    def can_move_to(self, x, y, tilemap):
-        """Check if the tile is walkable."""
-        if x < 0 or x >= len(tilemap[0]) or y < 0 or y >= len(tilemap):
-            return False  # Out of bounds
-        if tilemap[y][x] == 'W':  # Wall tile
-            return False
-        return True
-
-    def bfs(self, start, goal, tilemap):
-        """Breadth-first search to find the shortest path."""
-        queue = deque([start])
-        visited = set([start])
-        paths = {start: []}
-
-        while queue:
-            current = queue.popleft()
-            if current == goal:
-                return paths[current]
-
-            x, y = current
-            for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                new_x, new_y = x + dx, y + dy
-                if (new_x, new_y) not in visited and self.can_move_to(new_x, new_y, tilemap):
-                    queue.append((new_x, new_y))
-                    visited.add((new_x, new_y))
-                    paths[(new_x, new_y)] = paths[current] + [(new_x, new_y)]
-
-        return []
-
-    def start_moving(self, next_tile):
-        """Set the next tile as the target for movement."""
-        self.target_tile = next_tile
-        self.is_moving = True
-
-
-class Inky(pygame.sprite.Sprite):
-    def __init__(self, game, x, y):
-        self.game = game
-        self._layer = ENEMY_LAYER
-        self.groups = self.game.all_sprites, self.game.enemies
-        pygame.sprite.Sprite.__init__(self, self.groups)
-
-        self.image = pygame.image.load('assets/inky.png').convert_alpha()
-        self.image = pygame.transform.scale(self.image, (TILESIZE, TILESIZE))  # Scale enemy to TILESIZE
-        self.rect = self.image.get_rect()
-
-        # Tile coordinates
-        self.tile_x = x
-        self.tile_y = y
-
-        # Set initial pixel position based on tile coordinates
-        self.x = self.tile_x * TILESIZE
-        self.y = self.tile_y * TILESIZE
-        self.rect.topleft = (self.x, self.y)
-
-        # Movement attributes
-        self.is_moving = False
-        self.speed = GHOST_SPEED
-        self.last_move_time = pygame.time.get_ticks()
-
-        self.target_tile = None  # Target tile for movement
-        self.path = []  # Path to follow
-
-    def calculate_goal(self):
-        """Calculate the goal tile for Inky based on player's position and offset."""
-        player = self.game.player
-        radius = 2  # Offset distance from player
-        offset_x = radius if player.direction[0] >= 0 else -radius
-        offset_y = radius if player.direction[1] >= 0 else -radius
-        inky_goal_tile = (player.tile_x + offset_x, player.tile_y + offset_y)
-
-        # Clamp the goal to the tilemap boundaries
-        inky_goal_tile = (
-            max(0, min(len(tilemap[0]) - 1, inky_goal_tile[0])),
-            max(0, min(len(tilemap) - 1, inky_goal_tile[1]))
-        )
-        return inky_goal_tile
-
-    def move(self):
-        """Move towards the target tile or follow the path."""
-        current_time = pygame.time.get_ticks()
-
-        if self.target_tile and self.is_moving:
-            target_x, target_y = self.target_tile[0] * TILESIZE, self.target_tile[1] * TILESIZE
-            dx, dy = target_x - self.x, target_y - self.y
-            distance = (dx ** 2 + dy ** 2) ** 0.5
-
-            if distance > 0:
-                step_x = (dx / distance) * self.speed
-                step_y = (dy / distance) * self.speed
-                self.x += step_x
-                self.y += step_y
-                self.rect.topleft = (round(self.x), round(self.y))
-
-            # Snap to the target tile if close enough
-            if abs(dx) < self.speed and abs(dy) < self.speed:
-                self.x, self.y = target_x, target_y
-                self.rect.topleft = (self.x, self.y)
-                self.tile_x, self.tile_y = self.target_tile
-                self.is_moving = False
-
-        elif current_time - self.last_move_time > self.speed:
-            if not self.is_moving and not self.path:
-                start = (self.tile_x, self.tile_y)
-                goal = self.calculate_goal()
-                self.path = self.dfs(start, goal, tilemap)
-                self.last_move_time = current_time
-
-            if self.path:
-                next_tile = self.path.pop(0)
-                self.start_moving(next_tile)
-
-    def get_position(self):
-        """Return the current tile position."""
-        return self.tile_x, self.tile_y
-
-    def can_move_to(self, x, y, tilemap):
-        """Check if the tile is walkable."""
-        if x < 0 or x >= len(tilemap[0]) or y < 0 or y >= len(tilemap):
-            return False  # Out of bounds
-        if tilemap[y][x] == 'W':  # Wall tile
-            return False
-        return True
-
-    def dfs(self, start, goal, tilemap):
-        """DFS for pathfinding."""
-        stack = [(start, [])]
-        visited = set()
-
-        while stack:
-            current, path = stack.pop()
-            if current == goal:
-                return path
-
-            if current not in visited:
-                visited.add(current)
-                x, y = current
-
-                for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                    new_x, new_y = x + dx, y + dy
-                    if (new_x, new_y) not in visited and self.can_move_to(new_x, new_y, tilemap):
-                        stack.append(((new_x, new_y), path + [(new_x, new_y)]))
-
-        return []
-
-    def start_moving(self, next_tile):
-        """Set the next tile as the target for movement."""
-        self.target_tile = next_tile
-        self.is_moving = True
-
-
-class Pinky(pygame.sprite.Sprite):
-    def __init__(self, game, x, y):
-        self.game = game
-        self._layer = ENEMY_LAYER
-        self.groups = self.game.all_sprites, self.game.enemies
-        pygame.sprite.Sprite.__init__(self, self.groups)
-
-        self.image = pygame.image.load('assets/pinky.png').convert_alpha()
-        self.image = pygame.transform.scale(self.image, (TILESIZE, TILESIZE))  # Scale enemy to TILESIZE
-        self.rect = self.image.get_rect()
-
-        # Tile coordinates
-        self.tile_x = x
-        self.tile_y = y
-
-        # Set initial pixel position based on tile coordinates
-        self.x = self.tile_x * TILESIZE
-        self.y = self.tile_y * TILESIZE
-        self.rect.topleft = (self.x, self.y)
-
-        # Movement attributes
-        self.is_moving = False
-        self.speed = GHOST_SPEED
-        self.last_move_time = pygame.time.get_ticks()
-
-        self.target_tile = None  # Target tile for movement
-        self.path = []  # Path to follow
-
-    def calculate_goal(self):
-        """Calculate the goal tile based on the player's position and direction."""
-        player = self.game.player
-        dx, dy = player.direction
-        goal_x = player.tile_x + dx * 4
-        goal_y = player.tile_y + dy * 4
-
-        # Clamp the goal to the tilemap boundaries
-        goal_x = max(0, min(len(tilemap[0]) - 1, goal_x))
-        goal_y = max(0, min(len(tilemap) - 1, goal_y))
-
-        return goal_x, goal_y
-
-    def move(self):
-        """Move towards the target tile or follow the path."""
-        current_time = pygame.time.get_ticks()
-
-        if self.target_tile and self.is_moving:
-            target_x, target_y = self.target_tile[0] * TILESIZE, self.target_tile[1] * TILESIZE
-            dx, dy = target_x - self.x, target_y - self.y
-            distance = (dx ** 2 + dy ** 2) ** 0.5
-
-            if distance > 0:
-                step_x = (dx / distance) * self.speed
-                step_y = (dy / distance) * self.speed
-                self.x += step_x
-                self.y += step_y
-                self.rect.topleft = (round(self.x), round(self.y))
-
-            # Snap to the target tile if close enough
-            if abs(dx) < self.speed and abs(dy) < self.speed:
-                self.x, self.y = target_x, target_y
-                self.rect.topleft = (self.x, self.y)
-                self.tile_x, self.tile_y = self.target_tile
-                self.is_moving = False
-
-        elif current_time - self.last_move_time > self.speed:
-            if not self.is_moving and not self.path:
-                start = (self.tile_x, self.tile_y)
-                goal = self.calculate_goal()
-                self.path = self.bfs(start, goal, tilemap)
-                self.last_move_time = current_time
-
-            if self.path:
-                next_tile = self.path.pop(0)
-                self.start_moving(next_tile)
-
-    def get_position(self):
-        """Return the current tile position."""
-        return self.tile_x, self.tile_y
-
-    def can_move_to(self, x, y, tilemap):
-        """Check if the tile is walkable."""
-        if x < 0 or x >= len(tilemap[0]) or y < 0 or y >= len(tilemap):
-            return False  # Out of bounds
-        if tilemap[y][x] == 'W':  # Wall tile
-            return False
-        return True
-
-    def bfs(self, start, goal, tilemap):
-        """Breadth-First Search for pathfinding."""
-        queue = deque([start])
-        visited = set([start])
-        paths = {start: []}  # Store the path to each tile
-
-        while queue:
-            current = queue.popleft()
-            if current == goal:
-                return paths[current]
-
-            x, y = current
-            for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                new_x, new_y = x + dx, y + dy
-                if (new_x, new_y) not in visited and self.can_move_to(new_x, new_y, tilemap):
-                    queue.append((new_x, new_y))
-                    visited.add((new_x, new_y))
-                    paths[(new_x, new_y)] = paths[current] + [(new_x, new_y)]
-
-        return []  # No path found
-
-    def start_moving(self, next_tile):
-        """Set the next tile as the target for movement."""
-        self.target_tile = next_tile
-        self.is_moving = True
-
-
-
-class Clyde(pygame.sprite.Sprite):
-    def __init__(self, game, x, y):
-        self.game = game
-        self._layer = ENEMY_LAYER
-        self.groups = self.game.all_sprites, self.game.enemies
-        pygame.sprite.Sprite.__init__(self, self.groups)
-
-        self.image = pygame.image.load('assets/clyde.png').convert_alpha()
-        self.image = pygame.transform.scale(self.image, (TILESIZE, TILESIZE))  # Scale enemy to TILESIZE
-        self.rect = self.image.get_rect()
-
-        # Tile coordinates
-        self.tile_x = x
-        self.tile_y = y
-
-        # Set initial pixel position based on tile coordinates
-        self.x = self.tile_x * TILESIZE
-        self.y = self.tile_y * TILESIZE
-        self.rect.topleft = (self.x, self.y)
-
-        # Movement attributes
-        self.is_moving = False
-        self.speed = GHOST_SPEED
-        self.last_move_time = pygame.time.get_ticks()
-
-        self.target_tile = None  # Target tile Clyde is moving towards
-        self.path = []  # Path to follow
-
-    def move(self):
-        """Move Clyde towards the target tile."""
-        current_time = pygame.time.get_ticks()
-
-        if self.target_tile and self.is_moving:
-            target_x, target_y = self.target_tile[0] * TILESIZE, self.target_tile[1] * TILESIZE
-            dx, dy = target_x - self.x, target_y - self.y
-            distance = (dx ** 2 + dy ** 2) ** 0.5
-
-            if distance > 0:
-                step_x = (dx / distance) * self.speed
-                step_y = (dy / distance) * self.speed
-                self.x += step_x
-                self.y += step_y
-                self.rect.topleft = (round(self.x), round(self.y))
-
-            # Snap to the target tile if close enough
-            if abs(dx) < self.speed and abs(dy) < self.speed:
-                self.x, self.y = target_x, target_y
-                self.rect.topleft = (self.x, self.y)
-                self.tile_x, self.tile_y = self.target_tile
-                self.is_moving = False
-
-        elif current_time - self.last_move_time > self.speed:
-            if not self.is_moving and not self.path:
-                start = (self.tile_x, self.tile_y)
-                goal = (self.game.player.tile_x, self.game.player.tile_y)
-                self.path = self.dfs(start, goal, tilemap)
-                self.last_move_time = current_time
-
-            if self.path:
-                next_tile = self.path.pop(0)
-                self.start_moving(next_tile)
-
-    def get_position(self):
-        """Return the current tile position."""
-        return self.tile_x, self.tile_y
-
-    def can_move_to(self, x, y, tilemap):
-        """Check if the tile is walkable."""
-        if x < 0 or x >= len(tilemap[0]) or y < 0 or y >= len(tilemap):
-            return False  # Out of bounds
-        if tilemap[y][x] == 'W':  # Wall tile
-            return False
-        return True
-
-    def dfs(self, start, goal, tilemap):
-        """Depth-First Search for pathfinding."""
-        stack = [(start, [])]
-        visited = set()
-
-        while stack:
-            current, path = stack.pop()
-            if current == goal:
-                return path
-
-            if current not in visited:
-                visited.add(current)
-                x, y = current
-
-                for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:
-                    new_x, new_y = x + dx, y + dy
-                    if self.can_move_to(new_x, new_y, tilemap):
-                        stack.append(((new_x, new_y), path + [(new_x, new_y)]))
-
-        return []  # Return empty path if no valid path is found
-
-    def start_moving(self, next_tile):
-        """Set the next tile as the target for movement."""
-        self.target_tile = next_tile
-        self.is_moving = True
-
-
-
 class Block(pygame.sprite.Sprite):
     def __init__(self, game, x, y):
         self.game = game
         self._layer = BLOCK_LAYER
-        self.groups = self.game.all_sprites, self.game.blocks
+        self.groups = self.game.blocks  # Pre-rendered into the background, never updated
         pygame.sprite.Sprite.__init__(self, self.groups)
 
         self.image = pygame.Surface((TILESIZE, TILESIZE))
@@ -648,7 +246,7 @@ class Block(pygame.sprite.Sprite):
 class Pellet(pygame.sprite.Sprite):
     def __init__(self, game, x, y):
         self.game = game
-        self.groups = game.all_sprites, game.pellets
+        self.groups = game.pellets  # Pre-rendered into the background, erased when eaten
         pygame.sprite.Sprite.__init__(self, self.groups)
 
         self.image = pygame.Surface((TILESIZE // 2, TILESIZE // 2))
@@ -675,10 +273,11 @@ class Button:
         self.font = font
         self.color = color
         self.text_color = text_color
+        self.text_surface = font.render(text, True, text_color)  # The label never changes
 
     def draw(self, surface):
         pygame.draw.rect(surface, self.color, self.rect)
-        text_obj = self.font.render(self.text, True, self.text_color)
+        text_obj = self.text_surface
         text_rect = text_obj.get_rect(center=self.rect.center)
         surface.blit(text_obj, text_rect)
 
@@ -0,0 +1,111 @@
+# planner.py
+import threading
+import time
+from collections import deque, namedtuple
+
+# A completed plan: the best chromosome evolved for Pac-Man standing on start
+Plan = namedtuple('Plan', ['start', 'chromosome', 'generation', 'tick', 'published'])
+
+# What the planner sees of the world: copies taken by the game loop each tick
+WorldView = namedtuple('WorldView', ['player', 'ghosts', 'pellet_index', 'tick'])
+PlayerView = namedtuple('PlayerView', ['tile_x', 'tile_y'])
+
+
+class GhostView:
+    def __init__(self, positions):
+        self._positions = positions
+
+    def positions(self):
+        return self._positions
+
+
+class BackgroundPlanner:
+    """
+    Runs the genetic algorithm in a background thread.
+
+    The game loop hands over a view of the world with observe() and reads
+    the most recent completed plan with latest(); neither call ever waits
+    for the planner. Plans are published through a double buffer: the
+    planner fills the back slot, then flips which slot is the front.
+    The planner idles while there is nothing to plan for: before the first
+    observe(), once the level is cleared and after stop().
+    While it runs, a verbose GA's per-generation output is replaced by one
+    line every report_interval seconds: printing hundreds of generations a
+    second would take the interpreter from the game loop.
+    """
+    def __init__(self, ga, rate_window=1.0, report_interval=1.0):
+        self.ga = ga
+        self.verbose = ga.verbose  # The GA's own setting, restored by stop()
+        self.report_interval = report_interval
+        self.last_report = 0.0
+        self.buffers = [None, None]
+        self.front = 0  # Index of the slot readers use
+        self.view = None  # Latest WorldView from the game loop
+        self.generations = 0
+        self.rate_window = rate_window  # Seconds of history for generations_per_second
+        self.publish_times = deque()
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        if self.thread is None:
+            self.verbose = self.ga.verbose
+            self.ga.verbose = False
+            self.running = True
+            self.thread = threading.Thread(target=self.run, name='planner', daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        """Stop the thread and forget the level's view and plans; start() begins afresh."""
+        self.running = False
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+            self.ga.verbose = self.verbose
+        self.view = None
+        self.buffers = [None, None]
+        self.publish_times.clear()
+
+    def observe(self, world):
+        """Publish the world state the next generation should plan against."""
+        if world.pellet_count <= 0:
+            self.view = None  # Level cleared: nothing left to plan for
+            return
+        player = world.player
+        self.view = WorldView(PlayerView(player.tile_x, player.tile_y), GhostView(world.ghosts.positions()),
+                              world.pellet_index, world.ticks)
+
+    def latest(self):
+        """The most recent completed plan, or None before the first one."""
+        return self.buffers[self.front]
+
+    def plan_age(self):
+        """Seconds since the current plan was published, or None."""
+        plan = self.latest()
+        return None if plan is None else time.perf_counter() - plan.published
+
+    @property
+    def generations_per_second(self):
+        now = time.perf_counter()
+        while self.publish_times and now - self.publish_times[0] > self.rate_window:
+            self.publish_times.popleft()
+        return len(self.publish_times) / self.rate_window
+
+    def run(self):
+        while self.running:
+            view = self.view
+            if view is None:
+                time.sleep(0.001)
+                continue
+            chromosome = self.ga.evolve(view, None)
+            self.generations += 1
+            now = time.perf_counter()
+            back = 1 - self.front
+            self.buffers[back] = Plan((view.player.tile_x, view.player.tile_y), chromosome,
+                                      self.generations, view.tick, now)
+            self.front = back
+            self.publish_times.append(now)
+            if self.verbose and self.ga.fitness_history and now - self.last_report >= self.report_interval:
+                self.last_report = now
+                print(f"Planner generation {self.generations} max fitness: {self.ga.fitness_history[-1]}")
+            time.sleep(0)  # Let the game loop take the interpreter between generations
@@ -0,0 +1,140 @@
+# profiler.py
+import csv
+import functools
+import json
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+FIELDS = ['stage', 'calls', 'mean_ms', 'p50_ms', 'p95_ms', 'p99_ms', 'max_ms', 'total_ms']
+
+
+class Profiler:
+    """
+    Per-stage timings of the game loop and the model calls it makes.
+
+    The game loop times its own stages with start_frame() and lap(); model
+    methods are timed by instrument(), which wraps them on the instance. A
+    disabled profiler is simply None: nothing is wrapped and the loop skips
+    its lap() calls, so profiling costs nothing unless it is switched on.
+
+    Each stage keeps the last window samples for its p50/p95/p99 and running
+    totals for the whole run. Stages nest: 'tick' includes 'ga.evolve'.
+    The background planner records from its own thread, so recording and
+    reporting hold a lock.
+    """
+    def __init__(self, window=600):
+        self.window = window  # Samples per stage the percentiles are taken over
+        self.samples = {}  # Stage -> deque of the latest durations in seconds
+        self.calls = {}
+        self.totals = {}
+        self.maxima = {}
+        self.lock = threading.Lock()
+        self.instrumented = {}  # (id(obj), name) -> (obj, name), to undo instrument()
+        self.frame_start = None
+        self.last_lap = None
+
+    def record(self, stage, seconds):
+        with self.lock:
+            samples = self.samples.get(stage)
+            if samples is None:
+                samples = self.samples[stage] = deque(maxlen=self.window)
+                self.calls[stage] = 0
+                self.totals[stage] = 0.0
+                self.maxima[stage] = 0.0
+            samples.append(seconds)
+            self.calls[stage] += 1
+            self.totals[stage] += seconds
+            if seconds > self.maxima[stage]:
+                self.maxima[stage] = seconds
+
+    def start_frame(self):
+        self.frame_start = self.last_lap = time.perf_counter()
+
+    def lap(self, stage):
+        """Record the time since the previous lap (or the frame start) as stage."""
+        now = time.perf_counter()
+        self.record(stage, now - self.last_lap)
+        self.last_lap = now
+
+    def end_frame(self):
+        self.record('frame', time.perf_counter() - self.frame_start)
+
+    def instrument(self, obj, name, stage):
+        """Time every call of obj.name as stage. Instrumenting twice is a no-op."""
+        key = (id(obj), name)
+        if key in self.instrumented:
+            return
+        method = getattr(obj, name)
+        record = self.record
+
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            began = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                record(stage, time.perf_counter() - began)
+
+        setattr(obj, name, timed)  # The instance attribute shadows the class method
+        self.instrumented[key] = (obj, name)
+
+    def instrument_world(self, world):
+        """Time the world's tick and its hot model calls."""
+        self.instrument(world, 'step', 'tick')
+        self.instrument(world.ga, 'evolve', 'ga.evolve')
+        self.instrument(world.ga, 'evaluate_population', 'ga.fitness')
+        self.instrument(world.ghosts, 'step', 'ghosts.step')
+        player = world.player
+        if player is not None:
+            self.instrument(player, 'update', 'player.update')
+            self.instrument(player.ga, 'get_target', 'ga.get_target')
+            self.instrument(player.pathfinder, 'find_path', 'astar.find_path')
+
+    def remove(self):
+        """Undo every instrument(), restoring the original methods."""
+        for obj, name in self.instrumented.values():
+            delattr(obj, name)
+        self.instrumented.clear()
+
+    def report(self):
+        """One row per stage, slowest p99 first, with times in milliseconds."""
+        with self.lock:  # Snapshot: the planner thread may record while we report
+            stages = [(stage, np.array(samples), self.calls[stage], self.totals[stage], self.maxima[stage])
+                      for stage, samples in self.samples.items()]
+        rows = []
+        for stage, samples, calls, total, maximum in stages:
+            p50, p95, p99 = np.percentile(samples, [50, 95, 99]) * 1000
+            rows.append({
+                'stage': stage,
+                'calls': calls,
+                'mean_ms': round(total / calls * 1000, 4),
+                'p50_ms': round(p50, 4),
+                'p95_ms': round(p95, 4),
+                'p99_ms': round(p99, 4),
+                'max_ms': round(maximum * 1000, 4),
+                'total_ms': round(total * 1000, 2),
+            })
+        rows.sort(key=lambda row: row['p99_ms'], reverse=True)
+        return rows
+
+    def lines(self):
+        """The report as aligned text lines, for the console."""
+        lines = [f"{'stage':<16} {'p50':>7} {'p95':>7} {'p99':>7}  ms"]
+        for row in self.report():
+            lines.append(f"{row['stage']:<16} {row['p50_ms']:>7.2f} {row['p95_ms']:>7.2f} {row['p99_ms']:>7.2f}")
+        return lines
+
+    def dump(self, path):
+        """Write the report to path, as JSON for .json and as CSV otherwise."""
+        rows = self.report()
+        if path.endswith('.json'):
+            with open(path, 'w') as f:
+                json.dump(rows, f, indent=2)
+        else:
+            with open(path, 'w', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=FIELDS)
+                writer.writeheader()
+                writer.writerows(rows)
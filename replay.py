@@ -0,0 +1,182 @@
+# replay.py
+"""
+Record a seeded headless game to a compact binary replay log, or replay a
+log headlessly at full speed and verify it reproduces the same game.
+
+    python replay.py record --difficulty very_hard --levels 3 --seed 7 --output run.replay
+    python replay.py play run.replay
+
+A replay re-runs all the work of the original game (every GA generation,
+A* search and ghost step), so it is also a deterministic workload for
+comparing the performance of two builds.
+"""
+import argparse
+import json
+import struct
+import sys
+import time
+import zlib
+
+import numpy as np
+
+from world import DIFFICULTIES, World
+
+MAGIC = b'PMRP'
+VERSION = 1
+HEADER = struct.Struct('<4sBI')  # Magic, format version, length of the JSON settings
+LEVEL = struct.Struct('<IHBiI')  # Ticks, ghosts, cleared, score, collisions
+NO_MOVE = 255  # Move byte of a tick in which the player started no move
+
+# World settings a replay needs to rebuild the recorded world
+SETTINGS = ['difficulty', 'swarm_size', 'population_size', 'chromosome_length', 'mutation_rate',
+            'receding_horizon', 'fitness_cache_size']
+
+
+class ReplayRecorder:
+    """
+    Records a World's ticks: the move the player started (a byte, NO_MOVE
+    if none) and the tile id of every ghost (uint16 each). Only seeded,
+    synchronous worlds replay exactly, so other worlds are refused.
+    """
+    def __init__(self, world, settings):
+        if world.seed is None:
+            raise ValueError("Only seeded worlds can be recorded: pass World(seed=...)")
+        if world.planner is not None or world.ga_budget is not None:
+            raise ValueError("The background planner and anytime GA depend on wall-clock time and cannot be replayed")
+        self.world = world
+        self.settings = settings
+        self.levels = []  # Outcome and tick data of each finished level
+        self.moves = bytearray()
+        self.ghost_tiles = bytearray()
+        world.recorder = self
+
+    def start_level(self, world):
+        self.moves = bytearray()
+        self.ghost_tiles = bytearray()
+
+    def record_tick(self, world):
+        move = world.player.committed_move
+        self.moves.append(NO_MOVE if move is None else move)
+        self.ghost_tiles += world.ghosts.tile[:len(world.ghosts)].astype('<u2').tobytes()
+
+    def end_level(self, stats):
+        self.levels.append((stats, bytes(self.moves), bytes(self.ghost_tiles), len(self.world.ghosts)))
+
+    def save(self, path):
+        settings = json.dumps(dict(self.settings, seed=self.world.seed)).encode()
+        body = bytearray()
+        for stats, moves, ghost_tiles, ghosts in self.levels:
+            body += LEVEL.pack(stats['ticks'], ghosts, stats['cleared'], stats['score'], stats['collisions'])
+            body += moves + ghost_tiles
+        with open(path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, len(settings)) + settings)
+            f.write(zlib.compress(bytes(body), 9))
+
+
+def load(path):
+    """Read a replay log: (settings, [(outcome, moves, ghost tiles)] per level)."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    magic, version, length = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not a version {VERSION} replay log")
+    settings = json.loads(data[HEADER.size:HEADER.size + length])
+    body = zlib.decompress(data[HEADER.size + length:])
+    levels = []
+    offset = 0
+    while offset < len(body):
+        ticks, ghosts, cleared, score, collisions = LEVEL.unpack_from(body, offset)
+        offset += LEVEL.size
+        moves = np.frombuffer(body, np.uint8, ticks, offset)
+        offset += ticks
+        ghost_tiles = np.frombuffer(body, '<u2', ticks * ghosts, offset).reshape(ticks, ghosts)
+        offset += ghost_tiles.nbytes
+        outcome = {'ticks': ticks, 'cleared': bool(cleared), 'score': score, 'collisions': collisions}
+        levels.append((outcome, moves, ghost_tiles))
+    return settings, levels
+
+
+def build_world(settings):
+    return World(seed=settings['seed'], **{name: settings[name] for name in SETTINGS})
+
+
+def record(settings, levels, max_ticks, path):
+    """Play a seeded game of levels levels and write its replay log to path."""
+    world = build_world(settings)
+    recorder = ReplayRecorder(world, {name: settings[name] for name in SETTINGS})
+    for _ in range(levels):
+        recorder.end_level(world.run_level(max_ticks=max_ticks))
+    recorder.save(path)
+    return recorder.levels
+
+
+def play(path):
+    """
+    Re-run a replay log and check every tick against it.
+    Returns (ticks replayed, first mismatch or None).
+    """
+    settings, levels = load(path)
+    world = build_world(settings)
+    ticks = 0
+    for level, (outcome, moves, ghost_tiles) in enumerate(levels, 1):
+        world.start_level()
+        for tick in range(outcome['ticks']):
+            world.step()
+            ticks += 1
+            move = world.player.committed_move
+            if (NO_MOVE if move is None else move) != moves[tick]:
+                return ticks, f"level {level} tick {tick + 1}: player move {move}, recorded {moves[tick]}"
+            tiles = world.ghosts.tile[:len(world.ghosts)]
+            if not np.array_equal(tiles, ghost_tiles[tick]):
+                return ticks, (f"level {level} tick {tick + 1}: ghost tiles {tiles.tolist()}, "
+                               f"recorded {ghost_tiles[tick].tolist()}")
+        cleared = world.pellet_count <= 0
+        replayed = {'ticks': world.level_ticks, 'cleared': cleared, 'score': world.score,
+                    'collisions': world.collisions}
+        if replayed != outcome:
+            return ticks, f"level {level}: outcome {replayed}, recorded {outcome}"
+    return ticks, None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    commands = parser.add_subparsers(dest='command', required=True)
+    recorder = commands.add_parser('record', help='Play a seeded headless game and write its replay log')
+    recorder.add_argument('--difficulty', default='easy', choices=list(DIFFICULTIES))
+    recorder.add_argument('--levels', type=int, default=1)
+    recorder.add_argument('--seed', type=int, default=0)
+    recorder.add_argument('--swarm-size', type=int, default=100, help='Ghosts in the swarm difficulty')
+    recorder.add_argument('--population-size', type=int, default=100)
+    recorder.add_argument('--chromosome-length', type=int, default=50)
+    recorder.add_argument('--mutation-rate', type=float, default=0.1)
+    recorder.add_argument('--receding-horizon', action='store_true')
+    recorder.add_argument('--fitness-cache', type=int, default=0, metavar='SIZE')
+    recorder.add_argument('--max-ticks', type=int, default=100000, help='Give up on a level after this many ticks')
+    recorder.add_argument('--output', default='game.replay')
+    player = commands.add_parser('play', help='Replay a log headlessly and verify the outcome')
+    player.add_argument('path')
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.command == 'record':
+        settings = {
+            'seed': args.seed, 'difficulty': args.difficulty, 'swarm_size': args.swarm_size,
+            'population_size': args.population_size, 'chromosome_length': args.chromosome_length,
+            'mutation_rate': args.mutation_rate, 'receding_horizon': args.receding_horizon,
+            'fitness_cache_size': args.fitness_cache,
+        }
+        levels = record(settings, args.levels, args.max_ticks, args.output)
+        ticks = sum(stats['ticks'] for stats, _, _, _ in levels)
+        print(f"Recorded {len(levels)} level(s), {ticks} ticks, scores {[stats['score'] for stats, _, _, _ in levels]} "
+              f"in {time.perf_counter() - start:.2f}s to {args.output}")
+    else:
+        ticks, mismatch = play(args.path)
+        elapsed = time.perf_counter() - start
+        if mismatch is not None:
+            print(f"Replay diverged after {ticks} ticks: {mismatch}")
+            sys.exit(1)
+        print(f"Replay verified: {ticks} ticks in {elapsed:.2f}s, {ticks / elapsed:.0f} ticks/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,315 @@
+# world.py
+import random
+import time
+import pygame
+from collections import namedtuple
+from config import *
+from config import TilemapManager
+from object import *
+from model import GeneticAlgorithm
+from ghosts import GhostSystem
+from navigation import GhostNavigator, PelletIndex, navigation_graph
+from planner import BackgroundPlanner
+
+
+# Map tile each classic ghost spawns on
+GHOST_TILES = {'R': 'blinky', 'L': 'pinky', 'I': 'inky', 'C': 'clyde'}
+
+# Ghosts in play for each difficulty; 'swarm' cycles through all four up to swarm_size ghosts
+DIFFICULTIES = {
+    'easy': ['blinky'],
+    'medium': ['blinky', 'pinky'],
+    'hard': ['blinky', 'pinky', 'inky'],
+    'very_hard': ['blinky', 'pinky', 'inky', 'clyde'],
+    'swarm': ['blinky', 'pinky', 'inky', 'clyde'],
+}
+
+
+# Everything a level starts from, captured once per map and restored on every level start
+LevelSnapshot = namedtuple('LevelSnapshot', ['player_spawn', 'ghost_homes', 'pellets'])
+
+
+def reset_tilemap():
+    """
+    Restore the shared tilemap to its original layout.
+    The rows are overwritten in place so every holder of TilemapManager.tilemap
+    (players, pathfinders, genetic algorithms) sees the fresh map.
+    """
+    tilemap = TilemapManager.tilemap
+    if len(tilemap) == len(original_tilemap) and all(isinstance(row, list) for row in tilemap):
+        for row, original in zip(tilemap, original_tilemap):
+            row[:] = original
+    else:
+        tilemap[:] = [list(row) for row in original_tilemap]
+    return tilemap
+
+
+class TileRegistry:
+    """
+    Tile-indexed view of what occupies the map, answering each query with
+    one lookup: walls from the navigation graph, pellets from the pellet
+    bitboard and ghosts from the grid of tiles they stand on. Those grids are kept
+    in sync by movement, pellet pickup and level reset, so the cost does not
+    grow with the size of the map.
+    """
+    def __init__(self, graph, pellet_index, ghosts):
+        self.graph = graph
+        self.pellet_index = pellet_index
+        self.ghosts = ghosts
+
+    def wall_at(self, position):
+        """True for walls and positions off the map."""
+        return not self.graph.is_walkable(position)
+
+    def pellet_at(self, position):
+        return position in self.pellet_index
+
+    def ghost_at(self, position):
+        """True if a ghost stands on the tile; ghosts still moving into it do not count."""
+        return self.graph.in_bounds(position) and self.ghosts.standing[self.graph.tile_id(position)] > 0
+
+
+class World:
+    """
+    Headless game state: tilemap, player, ghosts, pellets and score.
+
+    The world advances by one fixed tick per step() and never touches the
+    display, so it can run as fast as the CPU allows. Game renders it;
+    benchmarks and batch tools drive it directly.
+
+    Pac-Man's moves come from one genetic algorithm, self.ga, built from the
+    population_size, chromosome_length and mutation_rate given here. With
+    background_planner it runs in its own thread and the player follows its
+    latest completed plan; otherwise the player evolves it whenever it picks
+    a move, which keeps runs deterministic. Setting lockstep pauses the
+    planner and evolves the same GA synchronously, so a windowed game can be
+    fast-forwarded without changing its outcome. With a ga_budget (seconds)
+    per tick, the synchronous evolutions instead run as many generations as
+    fit in that time and keep the best plan so far. With receding_horizon,
+    the GA shifts its population past every move made, so the plans it keeps
+    evolving start from Pac-Man's new tile. fitness_cache_size > 0 gives the
+    GA an LRU cache of fitness scores.
+    A profiler times every tick and the model calls made in it.
+
+    With a seed, the GA draws from a generator seeded from it, so a run is
+    reproduced exactly from the seed alone; without one it uses the global
+    random module. A recorder is handed every tick (see replay.py).
+    """
+    def __init__(self, difficulty='easy', headless=True, verbose=False,
+                 population_size=100, chromosome_length=50, mutation_rate=0.1, swarm_size=100,
+                 background_planner=False, ga_budget=None, receding_horizon=False,
+                 fitness_cache_size=0, profiler=None, seed=None):
+        self.difficulty = difficulty
+        self.swarm_size = swarm_size  # Ghost count of the 'swarm' difficulty
+        self.headless = headless  # Skip image loading when there is no display
+        self.verbose = verbose  # Print per-generation GA output
+        self.ga_budget = ga_budget  # Anytime GA time box per tick; None for one generation
+        self.receding_horizon = receding_horizon  # Warm-start the GA after every move
+        self.fitness_cache_size = fitness_cache_size  # Memoized fitness scores, 0 for no cache
+        self.seed = seed
+        self.random = None if seed is None else random.Random(seed)  # Source of the GA's seeds
+        self.recorder = None  # Receives every tick while a replay is recorded
+        self.tick_deadline = None  # perf_counter() by which this tick's GA budget is spent
+        self.lockstep = False  # Evolve synchronously even with a planner: outcomes independent of wall-clock time
+
+        # Sprite group holding the player; it is only drawn when rendered
+        self.all_sprites = pygame.sprite.Group()
+
+        self.tilemap = TilemapManager.tilemap
+        self.graph = navigation_graph(self.tilemap)
+        self.pellet_index = PelletIndex(self.graph, self.tilemap)  # Remaining pellets, nearest-pellet queries
+        self.ghost_navigation = GhostNavigator(self.graph)  # Shortest-path fields shared by the ghosts
+        self.ghosts = GhostSystem(self.graph, self.ghost_navigation)
+        self.registry = TileRegistry(self.graph, self.pellet_index, self.ghosts)  # O(1) wall, pellet and ghost queries
+        # Plans Pac-Man's moves, in the planner thread or when the player picks a move
+        self.ga = GeneticAlgorithm(
+            population_size, chromosome_length, mutation_rate, self.tilemap, verbose=verbose, budget=ga_budget,
+            receding_horizon=receding_horizon, cache_size=fitness_cache_size, seed=self.ga_seed()
+        )
+        self.planner = BackgroundPlanner(self.ga) if background_planner else None
+
+        self.ticks = 0  # Total ticks simulated by this world
+        self.level_ticks = 0  # Ticks since the current level started
+        self.pellet_count = 0
+        self.score = 0  # Score for the current level
+        self.collisions = 0  # Penalised ghost collisions in the current level
+        self.collision_cooldown_duration = 1.0  # 1 second cooldown
+        self.last_collision_time = -self.collision_cooldown_duration
+        self.player = None
+        self.snapshot = None  # LevelSnapshot of the map, taken on the first level start
+        self.profiler = None
+        self.set_profiler(profiler)
+
+    @property
+    def time(self):
+        """Simulated seconds since the current level started."""
+        return self.level_ticks / FPS
+
+    def get_ticks(self):
+        """Simulated milliseconds, the headless counterpart of pygame.time.get_ticks()."""
+        return self.ticks * 1000 // FPS
+
+    def ga_seed(self):
+        """Seed for the next GA built for this world, or None to use the global random module."""
+        return None if self.random is None else self.random.getrandbits(64)
+
+    def set_profiler(self, profiler):
+        """Start timing with profiler, or stop timing with None."""
+        if self.profiler is not None:
+            self.profiler.remove()
+        self.profiler = profiler
+        if profiler is not None:
+            profiler.instrument_world(self)
+
+    def state_hash(self):
+        """Zobrist hash of the pellets, the player's tile and the ghosts' tiles."""
+        player_key = int(self.graph.zobrist.player[self.graph.tile_id((self.player.tile_x, self.player.tile_y))])
+        return self.pellet_index.hash ^ player_key ^ self.ghosts.hash
+
+    def count_total_pellets(self):
+        return len(self.pellet_index)
+
+    def capture_level(self):
+        """Scan the freshly reset map once for the spawns and the initial pellet state."""
+        player_spawn = None
+        homes = {}
+        for row_index, row in enumerate(self.tilemap):
+            for col_index, tile in enumerate(row):
+                if tile == 'P':
+                    player_spawn = (col_index, row_index)
+                elif tile in GHOST_TILES:
+                    homes[GHOST_TILES[tile]] = (col_index, row_index)
+        self.pellet_index.reset(self.tilemap)
+        return LevelSnapshot(player_spawn, homes, self.pellet_index.state())
+
+    def start_level(self):
+        """
+        Reset the map and spawn the player and the ghosts for the current difficulty.
+        Levels are restored in place from the map's snapshot: the player, its
+        planners and the ghost arrays are reused rather than rebuilt.
+        """
+        reset_tilemap()
+        if self.snapshot is None:
+            self.snapshot = self.capture_level()
+        self.pellet_index.restore(self.snapshot.pellets)
+        self.ghosts.clear()
+        self.level_ticks = 0
+        self.score = 0
+        self.collisions = 0
+        self.last_collision_time = -self.collision_cooldown_duration
+        self.pellet_count = self.count_total_pellets()
+
+        if self.player is None:
+            self.player = Player(self, *self.snapshot.player_spawn)  # Pac-Man Player
+        else:
+            self.player.reset(*self.snapshot.player_spawn)
+            self.ga.reset()  # Search afresh, as on the first level
+
+        strategies = DIFFICULTIES[self.difficulty]
+        count = self.swarm_size if self.difficulty == 'swarm' else len(strategies)
+        for index in range(count):
+            strategy = strategies[index % len(strategies)]
+            self.ghosts.spawn(strategy, *self.snapshot.ghost_homes[strategy])
+
+        if self.profiler is not None:
+            self.profiler.instrument_world(self)  # The first level creates the player
+        if self.recorder is not None:
+            self.recorder.start_level(self)
+        if self.planning_in_background():
+            self.planner.observe(self)
+            self.planner.start()
+
+    def ga_time_left(self, share=1.0):
+        """Seconds of this tick's ga_budget still unspent, times share."""
+        return max(0.0, self.tick_deadline - time.perf_counter()) * share
+
+    def planning_in_background(self):
+        return self.planner is not None and not self.lockstep
+
+    def set_lockstep(self, lockstep):
+        """Switch between evolving the GA synchronously (True) and in the background planner (False)."""
+        if lockstep == self.lockstep:
+            return
+        self.lockstep = lockstep
+        if self.planner is None or self.player is None:
+            return
+        if lockstep:
+            self.planner.stop()  # Waits for the running generation: the GA is step()'s alone from now on
+        else:
+            self.planner.observe(self)
+            self.planner.start()
+
+    def stop(self):
+        """Stop background work; the next start_level() restarts it."""
+        if self.planner is not None:
+            self.planner.stop()
+
+    def step(self):
+        """
+        Advance the simulation by one tick.
+        Returns True once every pellet of the level has been eaten.
+        """
+        self.ticks += 1
+        self.level_ticks += 1
+        collected = self.player.collected_pellets
+        if self.ga_budget is not None:
+            self.tick_deadline = time.perf_counter() + self.ga_budget
+
+        self.player.update(self)  # Evolves the GA when the player picks a move
+        self.ghosts.step(self.player)
+
+        # Handling collisions with enemies, technically IFrames
+        if self.ghosts.collides(self.player.rect):
+            if self.time - self.last_collision_time >= self.collision_cooldown_duration:
+                self.score -= 500  # Deduct points on collision
+                self.collisions += 1
+                self.last_collision_time = self.time
+
+        # Update score and pellet count
+        eaten = self.player.collected_pellets - collected
+        if eaten:
+            self.pellet_count -= eaten
+            self.score += eaten * 100
+        if self.planning_in_background():
+            self.planner.observe(self)  # Next generations plan against this tick
+
+        if self.recorder is not None:
+            self.recorder.record_tick(self)
+        return self.pellet_count <= 0
+
+    def cache_hit_rate(self, hits=0, misses=0):
+        """Fitness cache hit rate of the GA since it had hits and misses lookups."""
+        cache = self.ga.fitness_cache
+        if cache is None:
+            return 0.0
+        lookups = cache.hits + cache.misses - hits - misses
+        return (cache.hits - hits) / lookups if lookups else 0.0
+
+    def run_level(self, max_ticks=None):
+        """
+        Play one level without rendering, as fast as possible.
+        Returns the level statistics; 'cleared' is False if max_ticks ran out first.
+        """
+        self.start_level()  # Resets the GA's history and statistics
+        rebuilds = self.pellet_index.rebuilds
+        cache = self.ga.fitness_cache
+        lookups = (cache.hits, cache.misses) if cache is not None else (0, 0)
+        cleared = False
+        while not cleared and (max_ticks is None or self.level_ticks < max_ticks):
+            cleared = self.step()
+
+        return {
+            'cleared': cleared,
+            'score': self.score,
+            'ticks': self.level_ticks,
+            'time': self.time,
+            'collisions': self.collisions,
+            'generations': len(self.ga.fitness_history),
+            # Full-map pellet scans (zero with the pellet index) and index refreshes
+            'tilemap_scans': self.ga.tilemap_scans,
+            'pellet_index_rebuilds': self.pellet_index.rebuilds - rebuilds,
+            # Anytime evolutions that went over ga_budget
+            'budget_overruns': self.ga.budget_overruns,
+            # Share of the GA's fitness evaluations answered by its cache
+            'fitness_cache_hit_rate': self.cache_hit_rate(*lookups),
+        }